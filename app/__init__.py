@@ -30,10 +30,11 @@ __url__ = 'https://github.com/Augusto240/scraping_natal_prefeitura'
 
 # Facilitar imports principais
 from .core import DatabaseManager
-from .services import PrefeituraScraper, FileUploader0x0st
+from .services import PrefeituraScraper, HttpPrefeituraScraper, FileUploader0x0st
 
 __all__ = [
     'DatabaseManager',
     'PrefeituraScraper', 
+    'HttpPrefeituraScraper',
     'FileUploader0x0st',
 ]
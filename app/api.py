@@ -1,11 +1,26 @@
-import logging
+import io
+import os
 import re
+import csv
+import json
+import time
+import logging
 from datetime import datetime
+from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 
-from core.database import DatabaseManager
+from core.database import AsyncDatabaseManager, parse_fields
+from core.cache import get_response_cache, etag_matches
+from core.metrics import REGISTRY, HTTP_REQUEST_SECONDS
+
+try:
+    import orjson
+except ImportError:  # serializador rápido opcional; cai para o json da biblioteca padrão
+    orjson = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,7 +42,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-db_manager = DatabaseManager()
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Rota declarada (ex.: /arquivos/{competencia}) para não explodir a cardinalidade
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=route.path if route else "unmatched",
+            status=str(status),
+        )
+
+def dumps_line(data):
+    if orjson is not None:
+        return orjson.dumps(data) + b"\n"
+    return (json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+async def ndjson_chunks(batches):
+    async for batch in batches:
+        yield b"".join(dumps_line(row) for row in batch)
+
+async def csv_chunks(batches, fields):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue().encode("utf-8")
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([row[field] for field in fields] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+
+async def logged_stream(chunks):
+    # Com os cabeçalhos já enviados não há como devolver 500; o erro fica no log e a resposta é truncada
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as e:
+        logger.error(f"Erro durante a exportação de publicações: {str(e)}")
+        raise
+
+db_manager = AsyncDatabaseManager()
+response_cache = get_response_cache()
+
+@app.on_event("startup")
+async def startup():
+    await db_manager.create_schema()
+    logger.info("Conexão com o banco de dados estabelecida com sucesso")
+
+@app.on_event("shutdown")
+async def shutdown():
+    await db_manager.dispose()
 
 @app.get("/")
 async def root():
@@ -35,25 +107,93 @@ async def root():
         "message": "API de Publicações da Prefeitura de Natal",
         "version": "1.0.0",
         "endpoints": [
-            {"path": "/arquivos", "description": "Lista todas as publicações"},
-            {"path": "/arquivos/{competencia}", "description": "Lista publicações por competência (YYYY-MM)"}
+            {"path": "/arquivos", "description": "Lista publicações paginadas (parâmetros: limit, cursor, fields)"},
+            {"path": "/arquivos/{competencia}", "description": "Lista publicações por competência (YYYY-MM)"},
+            {"path": "/arquivos/export", "description": "Exportação completa em streaming (parâmetros: format=ndjson|csv, competencia, fields)"},
+            {"path": "/busca", "description": "Busca textual no conteúdo dos PDFs (parâmetros: q, competencia, limit, offset)"},
+            {"path": "/metrics", "description": "Métricas no formato texto do Prometheus"}
         ]
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body = REGISTRY.render()
+    # Métricas da última execução do scraper (processo separado), se exportadas em arquivo.
+    # Famílias já presentes neste processo não são repetidas.
+    textfile = os.getenv("METRICS_TEXTFILE")
+    if textfile and os.path.exists(textfile):
+        local = set(re.findall(r"^# TYPE (\S+)", body, re.MULTILINE))
+        with open(textfile, "r", encoding="utf-8") as f:
+            scraper_metrics = f.read()
+        body += "".join(
+            line + "\n" for line in scraper_metrics.splitlines()
+            if not any(re.match(rf"(# (HELP|TYPE) )?{name}(_bucket|_sum|_count)?[ {{]", line) for name in local)
+        )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
 @app.get("/arquivos")
-async def list_publications():
+async def list_publications(
+    limit: int = Query(100, ge=1, le=1000, description="Quantidade máxima de publicações por página"),
+    cursor: Optional[str] = Query(None, description="Cursor devolvido em 'proximo_cursor' pela página anterior"),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula (ex: id,title,file_url)"),
+):
     try:
-        publications = db_manager.get_all_publications()
+        publications, next_cursor = await db_manager.get_publications_page(limit=limit, cursor=cursor, fields=fields)
         return {
             "total": len(publications),
-            "publicacoes": publications
+            "publicacoes": publications,
+            "proximo_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Erro ao listar publicações: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno ao buscar publicações")
 
+# Declarada antes de /arquivos/{competencia}, que também casaria com "export"
+@app.get("/arquivos/export")
+async def export_publications(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato: ndjson (uma publicação por linha) ou csv"),
+    competencia: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Restringe a uma competência (YYYY-MM)"),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula (ex: id,title,file_url)"),
+):
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    batches = db_manager.stream_publications(selected, competence=competencia)
+    if format == "csv":
+        chunks, media_type = csv_chunks(batches, selected), "text/csv"
+    else:
+        chunks, media_type = ndjson_chunks(batches), "application/x-ndjson"
+    filename = f"publicacoes-{competencia}.{format}" if competencia else f"publicacoes.{format}"
+    return StreamingResponse(
+        logged_stream(chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@app.get("/busca")
+async def search_publications(
+    q: str = Query(..., min_length=2, max_length=200, description='Termos de busca (aceita "frase exata", or e -termo)'),
+    competencia: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Restringe a uma competência (YYYY-MM)"),
+    limit: int = Query(20, ge=1, le=100, description="Quantidade máxima de resultados"),
+    offset: int = Query(0, ge=0, description="Resultados a pular, para paginação"),
+):
+    try:
+        results = await db_manager.search_publications(q, limit=limit, offset=offset, competence=competencia)
+        return {
+            "q": q,
+            "total": len(results),
+            "resultados": results
+        }
+    except Exception as e:
+        logger.error(f"Erro na busca textual: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno ao buscar publicações")
+
 @app.get("/arquivos/{competencia}")
-async def get_publications_by_competence(competencia: str):
+async def get_publications_by_competence(competencia: str, request: Request):
     if not re.match(r"^\d{4}-\d{2}$", competencia):
         raise HTTPException(
             status_code=400, 
@@ -64,12 +204,29 @@ async def get_publications_by_competence(competencia: str):
         year, month = map(int, competencia.split("-"))
         datetime(year, month, 1)
         
-        publications = db_manager.get_publications_by_competence(competencia)
-        return {
-            "competencia": competencia,
-            "total": len(publications),
-            "publicacoes": publications
-        }
+        cache_key = response_cache.competence_key(competencia)
+        # O backend padrão lê e grava arquivos; fora do event loop para não travar as outras requisições
+        cached = await run_in_threadpool(response_cache.get, cache_key)
+        if cached is None:
+            publications = await db_manager.get_publications_by_competence(competencia)
+            body = json.dumps({
+                "competencia": competencia,
+                "total": len(publications),
+                "publicacoes": publications
+            }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            # Resultados vazios não são cacheados para não mascarar falhas de consulta
+            if publications:
+                cached = await run_in_threadpool(response_cache.set, cache_key, body)
+            else:
+                cached = (body, response_cache.make_etag(body))
+
+        body, etag = cached
+        # Clientes e proxies revalidam sempre via ETag (304 barato), para não servir dados
+        # antigos depois que o scraper grava novas publicações
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
     except ValueError:
         raise HTTPException(status_code=400, detail="Data inválida")
     except Exception as e:
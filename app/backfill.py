@@ -0,0 +1,63 @@
+import os
+import logging
+from datetime import datetime, timedelta
+
+from sharding import run_sharded
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+def parse_competence(value):
+    try:
+        return datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise ValueError(f"Competência inválida: {value} (use AAAA-MM)")
+
+def competence_period(start_competence, end_competence):
+    """Converte ``AAAA-MM`` inicial e final no intervalo de datas que cobre os
+    meses inteiros, limitado a hoje."""
+    start_date = parse_competence(start_competence)
+    end_month = parse_competence(end_competence)
+    if end_month < start_date:
+        raise ValueError(f"Competência final {end_competence} é anterior à inicial {start_competence}")
+    next_month = (end_month.replace(day=28) + timedelta(days=4)).replace(day=1)
+    end_date = min(next_month - timedelta(days=1), datetime.now())
+    return start_date, end_date
+
+def report_throughput(summary):
+    seconds = max(summary["seconds"], 1e-9)
+    megabytes = summary["bytes"] / (1024 * 1024)
+    logger.info("📊 Resumo do backfill:")
+    logger.info(f"   Shards (meses): {summary['shards']} ({summary['failed_shards']} com falha)")
+    logger.info(f"   Listagem: {summary['discovered']} publicações novas em {summary['discovery_seconds']:.1f}s")
+    logger.info(f"   Downloads: {summary['downloaded']} arquivos, {megabytes:.1f} MB")
+    logger.info(f"   Uploads: {summary['uploaded']} | Registradas no banco: {summary['persisted']}")
+    logger.info(f"   Tempo total: {timedelta(seconds=int(seconds))}")
+    logger.info(f"   Vazão: {summary['persisted'] / seconds:.2f} publicações/s, {megabytes / seconds:.2f} MB/s")
+
+def run_backfill(start_competence, end_competence, workers=None, engine="http", headless=True,
+                 download_workers=None, max_publications=None, db_url=None):
+    """Reprocessa as competências de ``start_competence`` a ``end_competence``
+    (inclusive), um shard por mês, com no máximo ``workers`` listagens simultâneas.
+    ``max_publications`` limita cada mês, como no comando ``shard``.
+    Reexecutar o mesmo comando retoma de onde parou."""
+    start_date, end_date = competence_period(start_competence, end_competence)
+    workers = workers or int(os.getenv("BACKFILL_WORKERS", "4"))
+    logger.info(f"📚 Backfill das competências {start_competence} a {end_competence} com {workers} workers")
+
+    summary = run_sharded(
+        start_date,
+        end_date,
+        granularity="month",
+        workers=workers,
+        engine=engine,
+        headless=headless,
+        max_publications=max_publications,
+        download_workers=download_workers,
+        db_url=db_url,
+    )
+    report_throughput(summary)
+    return summary
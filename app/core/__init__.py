@@ -2,14 +2,33 @@
 Módulos core do sistema de scraping da Prefeitura de Natal.
 
 Este pacote contém as funcionalidades fundamentais do sistema:
-- database: Conexão e operações com PostgreSQL
+- database: Conexão e operações com PostgreSQL, incluindo a busca textual
+- cache: Cache de respostas da API com invalidação por competência
+- job_queue: Fila persistente do pipeline em etapas
+- shard_leases: Leases dos shards de data para scraping distribuído
 - Configurações e utilitários base
 """
 
-from .database import DatabaseManager
+from .database import DatabaseManager, AsyncDatabaseManager, Publication, ScrapeState, PipelineJob, ShardLease, PublicationText, UploadedFile, get_engine, init_db
+from .cache import ResponseCache, get_response_cache
+from .job_queue import JobQueue
+from .shard_leases import ShardLeaseQueue
 
 __all__ = [
     'DatabaseManager',
+    'AsyncDatabaseManager',
+    'Publication',
+    'ScrapeState',
+    'PipelineJob',
+    'ShardLease',
+    'PublicationText',
+    'UploadedFile',
+    'get_engine',
+    'init_db',
+    'ResponseCache',
+    'get_response_cache',
+    'JobQueue',
+    'ShardLeaseQueue',
 ]
 
 __version__ = '1.0.0'
@@ -0,0 +1,133 @@
+import os
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class LocalCacheBackend:
+    """Cache LRU em memória, restrito ao processo atual."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def set(self, key, body, etag, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+class FileCacheBackend:
+    """Cache compartilhado em diretório local, visível para todos os workers do
+    uvicorn (e para o processo de scraping) na mesma máquina. Faz o papel de um
+    backend externo como o Redis sem exigir um serviço adicional."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                expires_at = float(f.readline())
+                etag = f.readline().decode().strip()
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if expires_at <= time.time():
+            self.delete(key)
+            return None
+        return body, etag
+
+    def set(self, key, body, etag, ttl):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(f"{time.time() + ttl}\n{etag}\n".encode())
+                f.write(body)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar entrada de cache: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+class ResponseCache:
+    def __init__(self, backend=None, ttl=3600):
+        self.backend = backend or LocalCacheBackend()
+        self.ttl = ttl
+
+    @staticmethod
+    def competence_key(competence):
+        return f"competencia:{competence}"
+
+    @staticmethod
+    def make_etag(body):
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, body):
+        etag = self.make_etag(body)
+        self.backend.set(key, body, etag, self.ttl)
+        return body, etag
+
+    def invalidate(self, key):
+        self.backend.delete(key)
+
+    def invalidate_competences(self, competences):
+        for competence in set(competences):
+            self.invalidate(self.competence_key(competence))
+            logger.info(f"Cache da competência {competence} invalidado")
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+_response_cache = None
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None:
+        ttl = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+        # O padrão é o backend em arquivo: a invalidação feita pelo scraper (outro processo)
+        # precisa chegar à API. "local" só é seguro quando um único processo grava e serve.
+        if os.getenv("RESPONSE_CACHE_BACKEND", "file") == "file":
+            directory = os.getenv("RESPONSE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "natal_prefeitura_cache"))
+            backend = FileCacheBackend(directory)
+        else:
+            backend = LocalCacheBackend(max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")))
+        _response_cache = ResponseCache(backend=backend, ttl=ttl)
+    return _response_cache
@@ -1,12 +1,23 @@
 import os
+import base64
 import logging
+import threading
 from datetime import datetime
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text
+from sqlalchemy import (
+    create_engine, select, text, tuple_, event, DDL, Column, Integer, String, DateTime, Text, Float,
+    ForeignKey, Index, UniqueConstraint,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
+from .cache import get_response_cache
+from .metrics import DB_WRITE_SECONDS
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -17,6 +28,10 @@ Base = declarative_base()
 
 class Publication(Base):
     __tablename__ = "publications"
+    __table_args__ = (
+        UniqueConstraint("title", "publication_date", name="uq_publications_title_publication_date"),
+        Index("idx_publications_date_id", "publication_date", "id"),
+    )
     
     id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
@@ -41,62 +56,487 @@ class Publication(Base):
             "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S")
         }
 
+PUBLIC_FIELDS = ["id", "title", "publication_date", "competence", "original_link", "file_url", "created_at"]
+
+def parse_fields(fields):
+    if not fields:
+        return list(PUBLIC_FIELDS)
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    invalid = [field for field in selected if field not in PUBLIC_FIELDS]
+    if invalid:
+        raise ValueError(f"Campos inválidos: {', '.join(invalid)}. Campos disponíveis: {', '.join(PUBLIC_FIELDS)}")
+    return selected
+
+def serialize_row(row, fields):
+    data = {}
+    for field in fields:
+        value = row[field]
+        if field == "publication_date":
+            value = value.strftime("%Y-%m-%d")
+        elif field == "created_at" and value is not None:
+            value = value.strftime("%Y-%m-%d %H:%M:%S")
+        data[field] = value
+    return data
+
+def encode_cursor(publication_date, publication_id):
+    raw = f"{publication_date.isoformat()}|{publication_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date_str, id_str = raw.split("|")
+        return datetime.fromisoformat(date_str), int(id_str)
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+def build_page_query(limit, cursor=None, fields=None):
+    columns = [getattr(Publication, field) for field in fields]
+    # Colunas da chave de paginação são sempre lidas, mesmo que não sejam devolvidas
+    for key_column in (Publication.publication_date, Publication.id):
+        if key_column.key not in fields:
+            columns.append(key_column)
+
+    query = select(*columns).order_by(Publication.publication_date.desc(), Publication.id.desc())
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Publication.publication_date, Publication.id) < tuple_(cursor_date, cursor_id))
+    return query.limit(limit + 1)
+
+def build_page(rows, limit, fields):
+    rows = [row._mapping for row in rows]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["publication_date"], last["id"])
+    return [serialize_row(row, fields) for row in rows], next_cursor
+
+class ScrapeState(Base):
+    __tablename__ = "scrape_state"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String(50), nullable=False, unique=True)
+    last_publication_date = Column(DateTime, nullable=False)
+    last_link = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ScrapeState(source='{self.source}', date='{self.last_publication_date}')>"
+
+class PipelineJob(Base):
+    """Checkpoint de cada publicação no pipeline em etapas
+    (discovered -> downloaded -> uploaded -> persisted)."""
+    __tablename__ = "pipeline_jobs"
+    __table_args__ = (
+        Index("idx_pipeline_jobs_stage_id", "stage", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    link = Column(Text, nullable=False, unique=True)
+    title = Column(String(255), nullable=False)
+    publication_date = Column(DateTime, nullable=False)
+    competence = Column(String(7), nullable=False)
+    stage = Column(String(20), nullable=False, default="discovered")
+    file_path = Column(Text, nullable=True)
+    checksum = Column(String(64), nullable=True)
+    file_url = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PipelineJob(id={self.id}, stage='{self.stage}', title='{self.title[:30]}...')>"
+
+    def to_publication(self):
+        return {
+            "job_id": self.id,
+            "date": self.publication_date,
+            "competence": self.competence,
+            "title": self.title,
+            "link": self.link,
+            "file_path": self.file_path,
+            "checksum": self.checksum,
+            "file_url": self.file_url,
+        }
+
+class ShardLease(Base):
+    """Fatia (shard) de um período de scraping, distribuída entre processos ou
+    containers por meio de um lease com expiração."""
+    __tablename__ = "shard_leases"
+    __table_args__ = (
+        UniqueConstraint("start_date", "end_date", name="uq_shard_leases_period"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    publications = Column(Integer, nullable=True)
+    last_error = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ShardLease(id={self.id}, period='{self.start_date:%Y-%m-%d}..{self.end_date:%Y-%m-%d}', status='{self.status}')>"
+
+class UploadedFile(Base):
+    """Índice de uploads endereçado por conteúdo: SHA-256 do arquivo -> URL
+    pública no 0x0.st, para não reenviar o mesmo PDF."""
+    __tablename__ = "uploaded_files"
+
+    id = Column(Integer, primary_key=True)
+    checksum = Column(String(64), nullable=False, unique=True)
+    url = Column(Text, nullable=False)
+    file_name = Column(Text, nullable=True)
+    size = Column(Integer, nullable=True)
+    uploaded_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UploadedFile(checksum='{self.checksum[:12]}...', url='{self.url}')>"
+
+class PublicationText(Base):
+    """Texto extraído do PDF de cada publicação, indexado para a busca textual:
+    coluna ``search_vector`` (tsvector gerado + índice GIN) no PostgreSQL e
+    tabela virtual FTS5 no SQLite usado em desenvolvimento."""
+    __tablename__ = "publication_texts"
+
+    id = Column(Integer, primary_key=True)
+    publication_id = Column(Integer, ForeignKey("publications.id", ondelete="CASCADE"), nullable=False, unique=True)
+    content = Column(Text, nullable=False)
+    extracted_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PublicationText(publication_id={self.publication_id}, chars={len(self.content or '')})>"
+
+SEARCH_CONFIG = "portuguese"
+SEARCH_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2, FragmentDelimiter= … "
+
+# Objetos de busca específicos de cada banco, criados junto com a tabela
+for statement in (
+    f"ALTER TABLE publication_texts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', content)) STORED",
+    "CREATE INDEX IF NOT EXISTS idx_publication_texts_search ON publication_texts USING GIN (search_vector)",
+):
+    event.listen(PublicationText.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+for statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS publication_texts_fts USING fts5("
+    "content, content='publication_texts', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS publication_texts_ai AFTER INSERT ON publication_texts BEGIN "
+    "INSERT INTO publication_texts_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS publication_texts_ad AFTER DELETE ON publication_texts BEGIN "
+    "INSERT INTO publication_texts_fts(publication_texts_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS publication_texts_au AFTER UPDATE ON publication_texts BEGIN "
+    "INSERT INTO publication_texts_fts(publication_texts_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    "INSERT INTO publication_texts_fts(rowid, content) VALUES (new.id, new.content); END",
+):
+    event.listen(PublicationText.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+SEARCH_FIELDS = ["id", "title", "publication_date", "competence", "original_link", "file_url"]
+
+def build_search_query(dialect_name, competence=None):
+    """Consulta de busca textual com ``:q``, ``:limit`` e ``:offset``.
+    No PostgreSQL o ranking usa apenas o tsvector indexado; o trecho destacado
+    (ts_headline, que relê o texto) é gerado só para a página de resultados."""
+    competence_filter = "AND p.competence = :competence" if competence else ""
+    if dialect_name == "sqlite":
+        sql = f"""
+            SELECT p.id, p.title, p.publication_date, p.competence, p.original_link, p.file_url,
+                   -bm25(publication_texts_fts) AS rank,
+                   snippet(publication_texts_fts, 0, '<mark>', '</mark>', ' … ', 30) AS snippet
+            FROM publication_texts_fts
+            JOIN publication_texts t ON t.id = publication_texts_fts.rowid
+            JOIN publications p ON p.id = t.publication_id
+            WHERE publication_texts_fts MATCH :q {competence_filter}
+            ORDER BY rank DESC, p.publication_date DESC
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        sql = f"""
+            SELECT r.id, r.title, r.publication_date, r.competence, r.original_link, r.file_url, r.rank,
+                   ts_headline('{SEARCH_CONFIG}', t.content, websearch_to_tsquery('{SEARCH_CONFIG}', :q),
+                               '{SEARCH_HEADLINE_OPTIONS}') AS snippet
+            FROM (
+                SELECT p.id, p.title, p.publication_date, p.competence, p.original_link, p.file_url,
+                       t.id AS text_id, ts_rank(t.search_vector, query) AS rank
+                FROM publication_texts t
+                JOIN publications p ON p.id = t.publication_id,
+                     websearch_to_tsquery('{SEARCH_CONFIG}', :q) query
+                WHERE t.search_vector @@ query {competence_filter}
+                ORDER BY rank DESC, p.publication_date DESC
+                LIMIT :limit OFFSET :offset
+            ) r
+            JOIN publication_texts t ON t.id = r.text_id
+            ORDER BY r.rank DESC, r.publication_date DESC
+        """
+    return text(sql).columns(
+        id=Integer, title=String, publication_date=DateTime, competence=String,
+        original_link=Text, file_url=Text, rank=Float, snippet=Text,
+    )
+
+def search_params(dialect_name, q, limit, offset, competence=None):
+    if dialect_name == "sqlite":
+        # Cada termo vira uma frase FTS5, para que pontuação (ex.: "123/2025") não quebre a consulta
+        q = " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+    params = {"q": q, "limit": limit, "offset": offset}
+    if competence:
+        params["competence"] = competence
+    return params
+
+def serialize_search_row(row):
+    data = serialize_row(row._mapping, SEARCH_FIELDS)
+    # bm25 do SQLite dá valores da ordem de 1e-6; arredondar zeraria ou empataria o ranking
+    data["rank"] = float(row.rank or 0.0)
+    data["trecho"] = row.snippet
+    return data
+
+def build_database_url(driver="postgresql"):
+    db_user = os.getenv("DB_USER", "postgres")
+    db_password = os.getenv("DB_PASSWORD", "postgres")
+    db_host = os.getenv("DB_HOST", "localhost")
+    db_port = os.getenv("DB_PORT", "5432")
+    db_name = os.getenv("DB_NAME", "natal_prefeitura")
+    return f"{driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+def engine_options(db_url):
+    options = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    # SQLite (usado em desenvolvimento) não aceita parâmetros de QueuePool
+    if make_url(db_url).get_backend_name() != "sqlite":
+        options.update({
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        })
+    return options
+
+_engines = {}
+_async_engines = {}
+_schema_ready = set()
+_engines_lock = threading.Lock()
+
+def get_engine(db_url=None):
+    db_url = db_url or build_database_url()
+    with _engines_lock:
+        if db_url not in _engines:
+            _engines[db_url] = create_engine(db_url, **engine_options(db_url))
+        return _engines[db_url]
+
+def get_async_engine(db_url=None):
+    db_url = db_url or build_database_url("postgresql+asyncpg")
+    with _engines_lock:
+        if db_url not in _async_engines:
+            _async_engines[db_url] = create_async_engine(db_url, **engine_options(db_url))
+        return _async_engines[db_url]
+
+# Bancos criados antes da constraint única (title, publication_date) não a ganham com
+# create_all, e sem ela todo INSERT ... ON CONFLICT falha. A migração remove duplicatas
+# (mantém o menor id) e cria a constraint; é idempotente e serializada por advisory lock.
+PUBLICATIONS_UNIQUE_MIGRATION = """
+DO $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('uq_publications_title_publication_date'));
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'uq_publications_title_publication_date'
+          AND conrelid = 'publications'::regclass
+    ) THEN
+        RAISE NOTICE 'Criando constraint uq_publications_title_publication_date';
+        DELETE FROM publications a
+        USING publications b
+        WHERE a.title = b.title
+          AND a.publication_date = b.publication_date
+          AND a.id > b.id;
+        ALTER TABLE publications
+            ADD CONSTRAINT uq_publications_title_publication_date UNIQUE (title, publication_date);
+    END IF;
+END $$;
+"""
+
+def migrate_schema(conn):
+    """Ajustes em bancos existentes que ``create_all`` não aplica."""
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(PUBLICATIONS_UNIQUE_MIGRATION))
+
+def create_schema(conn):
+    Base.metadata.create_all(conn)
+    migrate_schema(conn)
+
+def init_db(engine=None):
+    engine = engine or get_engine()
+    if engine.url in _schema_ready:
+        return
+    try:
+        with engine.begin() as conn:
+            create_schema(conn)
+        _schema_ready.add(engine.url)
+        logger.info("Esquema do banco de dados verificado com sucesso")
+    except SQLAlchemyError as e:
+        logger.error(f"Erro ao criar o esquema do banco de dados: {str(e)}")
+        raise
+
 class DatabaseManager:
-    def __init__(self):
-        db_user = os.getenv("DB_USER", "postgres")
-        db_password = os.getenv("DB_PASSWORD", "postgres")
-        db_host = os.getenv("DB_HOST", "localhost")
-        db_port = os.getenv("DB_PORT", "5432")
-        db_name = os.getenv("DB_NAME", "natal_prefeitura")
-        self.db_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        
+    BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", "500"))
+
+    def __init__(self, db_url=None):
+        self.db_url = db_url or build_database_url()
+        self.engine = get_engine(self.db_url)
+        self.Session = sessionmaker(bind=self.engine)
+    
+    def _insert(self, table):
+        if self.engine.dialect.name == "sqlite":
+            return sqlite.insert(table)
+        return postgresql.insert(table)
+
+    def save_publications(self, publications, raise_errors=False):
+        rows = []
+        seen = set()
+        for pub in publications:
+            key = (pub["title"], pub["date"])
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append({
+                "title": pub["title"],
+                "publication_date": pub["date"],
+                "competence": pub["competence"],
+                "original_link": pub.get("link"),
+                "file_path": pub.get("file_path"),
+                "file_url": pub["file_url"],
+            })
+
+        saved_count = 0
+        saved_competences = set()
+        if not rows:
+            return saved_count
+
         try:
-            self.engine = create_engine(self.db_url)
-            Base.metadata.create_all(self.engine)
-            self.Session = sessionmaker(bind=self.engine)
-            logger.info("Conexão com o banco de dados estabelecida com sucesso")
+            # Deduplicação delegada à constraint única (title, publication_date)
+            with DB_WRITE_SECONDS.time(operation="save_publications"), self.engine.begin() as conn:
+                for start in range(0, len(rows), self.BATCH_SIZE):
+                    batch = rows[start:start + self.BATCH_SIZE]
+                    stmt = (
+                        self._insert(Publication.__table__)
+                        .values(batch)
+                        .on_conflict_do_nothing(index_elements=["title", "publication_date"])
+                        .returning(Publication.id, Publication.competence)
+                    )
+                    inserted = conn.execute(stmt).fetchall()
+                    saved_count += len(inserted)
+                    saved_competences.update(row.competence for row in inserted)
+
+            get_response_cache().invalidate_competences(saved_competences)
+
+            skipped = len(publications) - saved_count
+            if skipped:
+                logger.info(f"{skipped} publicações já existiam no banco e foram ignoradas")
+            logger.info(f"{saved_count} publicações salvas no banco de dados")
         except SQLAlchemyError as e:
-            logger.error(f"Erro ao conectar ao banco de dados: {str(e)}")
-            raise
+            saved_count = 0
+            logger.error(f"Erro ao salvar publicações: {str(e)}")
+            if raise_errors:
+                raise
+        
+        return saved_count
     
-    def save_publications(self, publications):
+    def get_high_water_mark(self, source="dom"):
         session = self.Session()
-        saved_count = 0
-        
         try:
-            for pub in publications:
-                existing = session.query(Publication).filter(
-                    Publication.title == pub["title"],
-                    Publication.publication_date == pub["date"]
-                ).first()
-                
-                if existing:
-                    logger.info(f"Publicação já existe no banco: {pub['title'][:30]}...")
-                    continue
-                new_publication = Publication(
-                    title=pub["title"],
-                    publication_date=pub["date"],
-                    competence=pub["competence"],
-                    original_link=pub.get("link"),
-                    file_path=pub.get("file_path"),
-                    file_url=pub["file_url"]
+            state = session.query(ScrapeState).filter(ScrapeState.source == source).first()
+            if not state:
+                return None
+            # Todas as publicações já gravadas a partir do dia da marca, não só a última:
+            # o site lista várias publicações por dia e o filtro reprocessa o dia inteiro
+            day_start = state.last_publication_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            links = {
+                link for (link,) in session.query(Publication.original_link).filter(
+                    Publication.publication_date >= day_start,
+                    Publication.original_link.isnot(None),
                 )
-                
-                session.add(new_publication)
-                saved_count += 1
-            
-            # Commit da transação
+            }
+            if state.last_link:
+                links.add(state.last_link)
+            return {"date": state.last_publication_date, "link": state.last_link, "links": links}
+        except SQLAlchemyError as e:
+            logger.error(f"Erro ao buscar marca d'água do scraping: {str(e)}")
+            return None
+        finally:
+            session.close()
+
+    def update_high_water_mark(self, publications, source="dom", discovered=None):
+        """Avança a marca até a publicação gravada mais recente. Com ``discovered``
+        (tudo o que a listagem trouxe), a marca não passa da mais antiga que ficou
+        sem gravar (download/upload falhou), para que ela seja listada de novo."""
+        if not publications:
+            return None
+
+        saved_links = {pub.get("link") for pub in publications}
+        pending = [pub["date"] for pub in discovered or [] if pub.get("link") not in saved_links]
+        if pending:
+            oldest_pending = min(pending)
+            publications = [pub for pub in publications if pub["date"] <= oldest_pending]
+            if not publications:
+                logger.info(f"Marca d'água mantida: {len(pending)} publicações listadas ainda não foram gravadas")
+                return None
+
+        latest = max(publications, key=lambda pub: pub["date"])
+        session = self.Session()
+        try:
+            state = session.query(ScrapeState).filter(ScrapeState.source == source).first()
+            if state and state.last_publication_date > latest["date"]:
+                return {"date": state.last_publication_date, "link": state.last_link}
+
+            if not state:
+                state = ScrapeState(source=source)
+                session.add(state)
+            state.last_publication_date = latest["date"]
+            state.last_link = latest.get("link")
             session.commit()
-            logger.info(f"{saved_count} publicações salvas no banco de dados")
-            
+            logger.info(f"Marca d'água atualizada: {latest['date'].strftime('%Y-%m-%d')} ({latest.get('link')})")
+            return {"date": state.last_publication_date, "link": state.last_link}
         except SQLAlchemyError as e:
             session.rollback()
-            logger.error(f"Erro ao salvar publicações: {str(e)}")
+            logger.error(f"Erro ao atualizar marca d'água do scraping: {str(e)}")
+            return None
         finally:
             session.close()
-        
-        return saved_count
-    
+
+    def get_publications_to_index(self, after_id=0, limit=100):
+        """Publicações com arquivo local e ainda sem texto extraído, em ordem de id."""
+        query = (
+            select(Publication.id, Publication.file_path)
+            .outerjoin(PublicationText, PublicationText.publication_id == Publication.id)
+            .where(PublicationText.id.is_(None), Publication.file_path.isnot(None), Publication.id > after_id)
+            .order_by(Publication.id)
+            .limit(limit)
+        )
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(query)]
+
+    def save_publication_texts(self, texts):
+        if not texts:
+            return 0
+        try:
+            with DB_WRITE_SECONDS.time(operation="save_publication_texts"), self.engine.begin() as conn:
+                stmt = self._insert(PublicationText.__table__).values(texts)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["publication_id"],
+                    set_={"content": stmt.excluded.content, "extracted_at": datetime.utcnow()},
+                )
+                conn.execute(stmt)
+            return len(texts)
+        except SQLAlchemyError as e:
+            logger.error(f"Erro ao salvar textos das publicações: {str(e)}")
+            return 0
+
     def get_all_publications(self):
         session = self.Session()
         try:
@@ -108,6 +548,13 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_publications_page(self, limit=100, cursor=None, fields=None):
+        fields = parse_fields(fields)
+        query = build_page_query(limit, cursor, fields)
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).fetchall()
+        return build_page(rows, limit, fields)
+
     def get_publications_by_competence(self, competence):
         session = self.Session()
         try:
@@ -122,6 +569,67 @@ class DatabaseManager:
         finally:
             session.close()
 
+class AsyncDatabaseManager:
+    """Acesso assíncrono (SQLAlchemy asyncio + asyncpg) usado pelas rotas da API,
+    para que consultas não bloqueiem o event loop."""
+
+    STREAM_BATCH_SIZE = int(os.getenv("DB_STREAM_BATCH_SIZE", "1000"))
+
+    def __init__(self, db_url=None):
+        self.db_url = db_url or build_database_url("postgresql+asyncpg")
+        self.engine = get_async_engine(self.db_url)
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def create_schema(self):
+        if self.engine.url in _schema_ready:
+            return
+        async with self.engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        _schema_ready.add(self.engine.url)
+
+    async def get_publications_page(self, limit=100, cursor=None, fields=None):
+        fields = parse_fields(fields)
+        query = build_page_query(limit, cursor, fields)
+        async with self.Session() as session:
+            rows = (await session.execute(query)).fetchall()
+        return build_page(rows, limit, fields)
+
+    async def get_publications_by_competence(self, competence):
+        query = select(Publication).filter(
+            Publication.competence == competence
+        ).order_by(Publication.publication_date.desc())
+        try:
+            async with self.Session() as session:
+                publications = (await session.execute(query)).scalars().all()
+            return [pub.to_dict() for pub in publications]
+        except SQLAlchemyError as e:
+            logger.error(f"Erro ao buscar publicações por competência: {str(e)}")
+            return []
+
+    async def stream_publications(self, fields, competence=None, batch_size=None):
+        """Percorre a tabela inteira com cursor no servidor (``yield_per``),
+        devolvendo lotes já serializados; a memória não cresce com o total."""
+        query = select(*[getattr(Publication, field) for field in fields]).order_by(
+            Publication.publication_date.desc(), Publication.id.desc()
+        )
+        if competence:
+            query = query.where(Publication.competence == competence)
+        query = query.execution_options(yield_per=batch_size or self.STREAM_BATCH_SIZE)
+        async with self.Session() as session:
+            result = await session.stream(query)
+            async for partition in result.partitions():
+                yield [serialize_row(row._mapping, fields) for row in partition]
+
+    async def search_publications(self, q, limit=20, offset=0, competence=None):
+        dialect_name = self.engine.dialect.name
+        query = build_search_query(dialect_name, competence)
+        async with self.Session() as session:
+            rows = (await session.execute(query, search_params(dialect_name, q, limit, offset, competence))).fetchall()
+        return [serialize_search_row(row) for row in rows]
+
+    async def dispose(self):
+        await self.engine.dispose()
+
 if __name__ == "__main__":
-    db_manager = DatabaseManager()
+    init_db()
     print("Conexão com o banco de dados estabelecida com sucesso!")
\ No newline at end of file
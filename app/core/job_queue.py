@@ -0,0 +1,154 @@
+import os
+import socket
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+
+from .database import PipelineJob, get_engine, build_database_url, init_db
+from .metrics import DB_WRITE_SECONDS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+STAGE_DISCOVERED = "discovered"
+STAGE_DOWNLOADED = "downloaded"
+STAGE_UPLOADED = "uploaded"
+STAGE_PERSISTED = "persisted"
+STAGES = [STAGE_DISCOVERED, STAGE_DOWNLOADED, STAGE_UPLOADED, STAGE_PERSISTED]
+
+class JobQueue:
+    """Fila persistente de publicações do pipeline em etapas.
+
+    Workers reservam itens pendentes de uma etapa com ``claim`` (``FOR UPDATE
+    SKIP LOCKED`` no PostgreSQL) e um lease de ``lease_seconds``: se o processo
+    morrer, o item volta a ficar disponível quando o lease expira."""
+
+    BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", "500"))
+
+    def __init__(self, db_url=None, max_attempts=None, lease_seconds=None, worker_id=None):
+        self.db_url = db_url or build_database_url()
+        self.engine = get_engine(self.db_url)
+        init_db(self.engine)
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.max_attempts = max_attempts or int(os.getenv("PIPELINE_MAX_ATTEMPTS", "3"))
+        self.lease_seconds = lease_seconds or int(os.getenv("PIPELINE_LEASE_SECONDS", "600"))
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    def _insert(self):
+        if self.engine.dialect.name == "sqlite":
+            return sqlite.insert(PipelineJob.__table__)
+        return postgresql.insert(PipelineJob.__table__)
+
+    def enqueue(self, publications):
+        rows = {}
+        for pub in publications:
+            rows.setdefault(pub["link"], {
+                "link": pub["link"],
+                "title": pub["title"][:255],
+                "publication_date": pub["date"],
+                "competence": pub["competence"],
+                "stage": STAGE_DISCOVERED,
+                "attempts": 0,
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+            })
+        if not rows:
+            return 0
+
+        # Publicações já conhecidas mantêm a etapa em que pararam. Em lotes: o SQLite limita
+        # a quantidade de parâmetros por comando
+        rows = list(rows.values())
+        inserted = 0
+        with self.engine.begin() as conn:
+            for start in range(0, len(rows), self.BATCH_SIZE):
+                stmt = self._insert().values(rows[start:start + self.BATCH_SIZE])
+                inserted += conn.execute(stmt.on_conflict_do_nothing(index_elements=["link"])).rowcount
+        logger.info(f"📥 {inserted} publicações novas na fila ({len(rows) - inserted} já conhecidas)")
+        return inserted
+
+    def claim(self, stage, limit=50, claimed_before=None):
+        """Reserva até ``limit`` itens da etapa. Com ``claimed_before`` ignora os
+        itens tocados (reservados, avançados ou com falha) a partir desse instante,
+        para que cada item seja tentado uma única vez por etapa."""
+        now = datetime.utcnow()
+        session = self.Session()
+        try:
+            query = (
+                select(PipelineJob)
+                .where(
+                    PipelineJob.stage == stage,
+                    PipelineJob.attempts < self.max_attempts,
+                    or_(PipelineJob.locked_until.is_(None), PipelineJob.locked_until < now),
+                )
+                .order_by(PipelineJob.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            if claimed_before:
+                query = query.where(PipelineJob.updated_at < claimed_before)
+            jobs = session.execute(query).scalars().all()
+            for job in jobs:
+                job.locked_by = self.worker_id
+                job.locked_until = now + timedelta(seconds=self.lease_seconds)
+                job.updated_at = now
+            session.commit()
+            return [job.to_publication() for job in jobs]
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Erro ao reservar itens da etapa {stage}: {str(e)}")
+            return []
+        finally:
+            session.close()
+
+    def advance(self, job_id, stage, **fields):
+        values = {"stage": stage, "last_error": None, "locked_by": None, "locked_until": None,
+                  "updated_at": datetime.utcnow()}
+        values.update(fields)
+        with DB_WRITE_SECONDS.time(operation="job_advance"), self.engine.begin() as conn:
+            conn.execute(update(PipelineJob).where(PipelineJob.id == job_id).values(**values))
+
+    def fail(self, job_id, error):
+        with DB_WRITE_SECONDS.time(operation="job_fail"), self.engine.begin() as conn:
+            conn.execute(
+                update(PipelineJob)
+                .where(PipelineJob.id == job_id)
+                .values(
+                    attempts=PipelineJob.attempts + 1,
+                    last_error=str(error)[:1000],
+                    locked_by=None,
+                    locked_until=None,
+                    updated_at=datetime.utcnow(),
+                )
+            )
+
+    def reset_attempts(self):
+        with self.engine.begin() as conn:
+            reset = conn.execute(
+                update(PipelineJob)
+                .where(PipelineJob.stage != STAGE_PERSISTED, PipelineJob.attempts > 0)
+                .values(attempts=0, updated_at=datetime.utcnow())
+            ).rowcount
+        if reset:
+            logger.info(f"🔁 {reset} itens com falhas anteriores liberados para nova tentativa")
+        return reset
+
+    def counts(self):
+        query = select(PipelineJob.stage, func.count()).group_by(PipelineJob.stage)
+        with self.engine.connect() as conn:
+            counts = dict(conn.execute(query).fetchall())
+        return {stage: counts.get(stage, 0) for stage in STAGES}
+
+    def exhausted(self):
+        query = select(func.count()).select_from(PipelineJob).where(
+            PipelineJob.stage != STAGE_PERSISTED,
+            PipelineJob.attempts >= self.max_attempts,
+        )
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
@@ -0,0 +1,201 @@
+import os
+import time
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple((name, labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        with self._lock:
+            if not self._values:
+                return []
+            lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple((name, labels.get(name, "")) for name in self.labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0, "max": 0.0}
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+            series["max"] = max(series["max"], value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Mede a duração do bloco. Rótulos podem ser ajustados dentro do bloco
+        pelo dicionário devolvido (ex.: ``labels["result"] = "error"``)."""
+        labels = dict(labels)
+        start = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(series, counts=list(series["counts"])) for key, series in self._series.items()}
+
+    def render(self):
+        snapshot = self.snapshot()
+        if not snapshot:
+            return []
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                labels = key + (("le", _format_value(bound) if bound == float("inf") else str(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+class MetricsRegistry:
+    """Registro de métricas em memória, sem dependência de coletor externo.
+    Exporta no formato texto do Prometheus e gera um resumo para os logs."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Grava as métricas para o textfile collector do node_exporter (ou para
+        a rota /metrics da API ler), de forma atômica."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar métricas em {path}: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def log_summary(self, log=None):
+        log = log or logger
+        with self._lock:
+            histograms = [metric for metric in self._metrics.values() if isinstance(metric, Histogram)]
+        rows = []
+        for histogram in histograms:
+            for key, series in histogram.snapshot().items():
+                if series["count"]:
+                    label = ",".join(f"{name}={value}" for name, value in key)
+                    rows.append((series["sum"], f"{histogram.name}{'{' + label + '}' if label else ''}", series))
+        if not rows:
+            return
+        log.info("⏱️ Onde o tempo foi gasto:")
+        for total, name, series in sorted(rows, key=lambda row: -row[0]):
+            log.info(
+                f"   {name}: {total:.2f}s em {series['count']} operações "
+                f"(média {total / series['count']:.3f}s, máx {series['max']:.3f}s)"
+            )
+
+REGISTRY = MetricsRegistry()
+
+PAGE_LOAD_SECONDS = REGISTRY.histogram(
+    "scraper_page_load_seconds", "Tempo de carregamento de páginas da listagem", ["engine"])
+PARSE_SECONDS = REGISTRY.histogram(
+    "scraper_parse_seconds", "Tempo de extração das publicações de uma página", ["engine"])
+DOWNLOAD_SECONDS = REGISTRY.histogram(
+    "scraper_download_seconds", "Tempo de download de cada publicação", ["result"])
+DOWNLOAD_BYTES = REGISTRY.counter(
+    "scraper_download_bytes_total", "Bytes de PDF baixados")
+UPLOAD_SECONDS = REGISTRY.histogram(
+    "uploader_upload_seconds", "Tempo de upload de cada arquivo para 0x0.st", ["result"])
+DB_WRITE_SECONDS = REGISTRY.histogram(
+    "db_write_seconds", "Tempo de escrita no banco de dados", ["operation"])
+STAGE_SECONDS = REGISTRY.histogram(
+    "pipeline_stage_seconds", "Duração de cada etapa do processo completo", ["stage"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Latência das requisições da API", ["method", "route", "status"])
+
+def export_run_metrics(log=None):
+    """Fim de uma execução do scraper: resumo nos logs e, se ``METRICS_TEXTFILE``
+    estiver definido, exportação em arquivo."""
+    REGISTRY.log_summary(log)
+    path = os.getenv("METRICS_TEXTFILE")
+    if path:
+        REGISTRY.write_textfile(path)
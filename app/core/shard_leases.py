@@ -0,0 +1,170 @@
+import os
+import socket
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, func, or_, and_, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+
+from .database import ShardLease, get_engine, build_database_url, init_db
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+SHARD_PENDING = "pending"
+SHARD_LEASED = "leased"
+SHARD_DONE = "done"
+SHARD_FAILED = "failed"
+
+class ShardLeaseQueue:
+    """Tabela de leases dos shards de data. Qualquer processo ou container com
+    acesso ao banco pode pegar o próximo shard livre; um lease expirado (worker
+    que morreu) devolve o shard para a fila."""
+
+    def __init__(self, db_url=None, lease_seconds=None, max_attempts=None, owner=None):
+        self.db_url = db_url or build_database_url()
+        self.engine = get_engine(self.db_url)
+        init_db(self.engine)
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.lease_seconds = lease_seconds or int(os.getenv("SHARD_LEASE_SECONDS", "900"))
+        self.max_attempts = max_attempts or int(os.getenv("SHARD_MAX_ATTEMPTS", "3"))
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+
+    def _insert(self):
+        if self.engine.dialect.name == "sqlite":
+            return sqlite.insert(ShardLease.__table__)
+        return postgresql.insert(ShardLease.__table__)
+
+    def register(self, shards):
+        rows = [
+            {"start_date": start, "end_date": end, "status": SHARD_PENDING, "attempts": 0,
+             "updated_at": datetime.utcnow()}
+            for start, end in shards
+        ]
+        if not rows:
+            return 0
+        # Shards já registrados (inclusive concluídos) não são recriados
+        stmt = self._insert().values(rows).on_conflict_do_nothing(index_elements=["start_date", "end_date"])
+        with self.engine.begin() as conn:
+            inserted = conn.execute(stmt).rowcount
+            # Shards que esgotaram as tentativas em execuções anteriores ganham uma nova chance
+            retried = conn.execute(
+                update(ShardLease)
+                .where(
+                    ShardLease.status == SHARD_FAILED,
+                    tuple_(ShardLease.start_date, ShardLease.end_date).in_(list(shards)),
+                )
+                .values(status=SHARD_PENDING, attempts=0, updated_at=datetime.utcnow())
+            ).rowcount
+        logger.info(f"🧩 {inserted} shards registrados ({len(rows) - inserted} já existiam, {retried} reabertos)")
+        return inserted
+
+    def lease_next(self):
+        now = datetime.utcnow()
+        session = self.Session()
+        try:
+            query = (
+                select(ShardLease)
+                .where(
+                    ShardLease.attempts < self.max_attempts,
+                    or_(
+                        ShardLease.status == SHARD_PENDING,
+                        and_(ShardLease.status == SHARD_LEASED, ShardLease.lease_expires_at < now),
+                    ),
+                )
+                .order_by(ShardLease.start_date)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            shard = session.execute(query).scalars().first()
+            if shard is None:
+                return None
+            if shard.status == SHARD_LEASED:
+                logger.warning(f"Lease do shard {shard.id} expirou (worker {shard.owner}), reatribuindo")
+            shard.status = SHARD_LEASED
+            shard.owner = self.owner
+            shard.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+            shard.attempts += 1
+            session.commit()
+            return {"id": shard.id, "start_date": shard.start_date, "end_date": shard.end_date}
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Erro ao obter lease de shard: {str(e)}")
+            return None
+        finally:
+            session.close()
+
+    def renew(self, shard_id):
+        """Estende o lease de um shard ainda em posse deste worker. Retorna
+        False se o lease já expirou e foi reatribuído a outro worker."""
+        with self.engine.begin() as conn:
+            renewed = conn.execute(
+                update(ShardLease)
+                .where(ShardLease.id == shard_id, ShardLease.owner == self.owner,
+                       ShardLease.status == SHARD_LEASED)
+                .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds),
+                        updated_at=datetime.utcnow())
+            ).rowcount
+        if not renewed:
+            logger.warning(f"⚠️ Lease do shard {shard_id} não pertence mais a {self.owner}")
+        return bool(renewed)
+
+    @contextmanager
+    def heartbeat(self, shard_id, interval=None):
+        """Renova o lease em segundo plano enquanto o bloco executa, para que um
+        shard demorado não seja reatribuído com o worker ainda vivo."""
+        interval = interval or max(self.lease_seconds / 3, 1)
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(interval):
+                try:
+                    if not self.renew(shard_id):
+                        return
+                except SQLAlchemyError as e:
+                    logger.error(f"Erro ao renovar lease do shard {shard_id}: {str(e)}")
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, shard_id, publications):
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(ShardLease)
+                .where(ShardLease.id == shard_id, ShardLease.owner == self.owner)
+                .values(status=SHARD_DONE, publications=publications, last_error=None,
+                        lease_expires_at=None, updated_at=datetime.utcnow())
+            )
+
+    def fail(self, shard_id, error):
+        with self.engine.begin() as conn:
+            shard = conn.execute(select(ShardLease.attempts).where(ShardLease.id == shard_id)).first()
+            status = SHARD_FAILED if shard and shard.attempts >= self.max_attempts else SHARD_PENDING
+            conn.execute(
+                update(ShardLease)
+                .where(ShardLease.id == shard_id, ShardLease.owner == self.owner)
+                .values(status=status, last_error=str(error)[:1000], lease_expires_at=None,
+                        updated_at=datetime.utcnow())
+            )
+
+    def counts(self, shards=None):
+        query = select(ShardLease.status, func.count()).group_by(ShardLease.status)
+        if shards:
+            query = query.where(
+                ShardLease.start_date >= min(start for start, _ in shards),
+                ShardLease.end_date <= max(end for _, end in shards),
+            )
+        with self.engine.connect() as conn:
+            return dict(conn.execute(query).fetchall())
@@ -5,8 +5,9 @@ import sys
 from datetime import datetime
 
 # Imports simplificados usando os __init__.py
-from services import PrefeituraScraper, FileUploader0x0st
-from core import DatabaseManager
+from services import PrefeituraScraper, HttpPrefeituraScraper, FileUploader0x0st, TextExtractor
+from core import DatabaseManager, init_db
+from core.metrics import STAGE_SECONDS, export_run_metrics
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,14 +19,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def run_full_process(headless=True):
+def scrape_publications(headless=True, engine="http", download_workers=None, max_publications=None,
+                        high_water_mark=None):
+    options = {
+        "download_workers": download_workers,
+        "max_publications": max_publications,
+        "high_water_mark": high_water_mark,
+    }
+    http_error = None
+    if engine == "http":
+        scraper = HttpPrefeituraScraper(**options)
+        publications = []
+        try:
+            publications = scraper.run()
+        except Exception as e:
+            logger.warning(f"⚠️ Erro no scraping via HTTP: {str(e)}")
+            http_error = e
+        # Listagem vazia só significa "nada novo" se foi lida até o fim
+        if publications or (high_water_mark and scraper.listing_fetched and http_error is None):
+            return publications, scraper
+        logger.warning("⚠️ Motor HTTP não retornou publicações, usando Selenium como fallback")
+
+    scraper = PrefeituraScraper(headless=headless, **options)
+    publications = scraper.run()
+    if not publications and http_error is not None:
+        raise http_error
+    return publications, scraper
+
+def advance_high_water_mark(db_manager, scraper, persisted):
+    # Publicações listadas que não chegaram ao banco ficam acima da marca e voltam na próxima execução
+    if scraper.truncated:
+        logger.warning("⚠️ Listagem cortada por --max-publications; marca d'água mantida")
+        return None
+    return db_manager.update_high_water_mark(persisted, discovered=scraper.discovered)
+
+def load_high_water_mark():
+    try:
+        init_db()
+        high_water_mark = DatabaseManager().get_high_water_mark()
+    except Exception as db_error:
+        logger.warning(f"⚠️ Não foi possível ler a marca d'água no banco: {str(db_error)}")
+        return None
+
+    if high_water_mark:
+        logger.info(f"🔖 Modo incremental a partir de {high_water_mark['date'].strftime('%d/%m/%Y')}")
+    else:
+        logger.info("🔖 Nenhuma marca d'água encontrada, executando coleta completa")
+    return high_water_mark
+
+def run_full_process(headless=True, engine="http", download_workers=None, max_publications=None,
+                     incremental=False):
     start_time = datetime.now()
     logger.info(f"🚀 Iniciando processo completo às {start_time}")
     
     try:
-        logger.info("🔍 Iniciando scraping do site da prefeitura")
-        scraper = PrefeituraScraper(headless=headless)
-        publications = scraper.run()
+        high_water_mark = load_high_water_mark() if incremental else None
+
+        logger.info(f"🔍 Iniciando scraping do site da prefeitura (motor: {engine})")
+        with STAGE_SECONDS.time(stage="scrape"):
+            publications, scraper = scrape_publications(
+                headless=headless,
+                engine=engine,
+                download_workers=download_workers,
+                max_publications=max_publications,
+                high_water_mark=high_water_mark,
+            )
         
         if not publications:
             logger.warning("⚠️ Nenhuma publicação encontrada")
@@ -36,33 +94,60 @@ def run_full_process(headless=True):
         logger.info("📤 Iniciando upload dos arquivos para 0x0.st")
         uploader = FileUploader0x0st()
         
-        file_paths = [pub.get('file_path') for pub in publications if pub.get('file_path')]
+        file_paths = [pub['file_path'] for pub in publications if pub.get('file_path')]
         
         if not file_paths:
             logger.warning("⚠️ Nenhum arquivo encontrado para upload")
             return False
  
-        uploaded_urls = uploader.upload_multiple_files(file_paths)
+        checksums = {
+            str(pub['file_path']): pub['checksum']
+            for pub in publications if pub.get('file_path') and pub.get('checksum')
+        }
+        with STAGE_SECONDS.time(stage="upload"):
+            uploaded_urls = uploader.upload_multiple_files(file_paths, checksums=checksums)
         
         if not uploaded_urls:
             logger.warning("⚠️ Nenhum arquivo foi enviado com sucesso para 0x0.st")
             return False
 
-        for i, pub in enumerate(publications):
-            if i < len(uploaded_urls):
-                pub['file_url'] = uploaded_urls[i]
+        # Associa cada URL à sua publicação pelo caminho do arquivo, não pela posição
+        for pub in publications:
+            if pub.get('file_path'):
+                pub['file_url'] = uploaded_urls.get(str(pub['file_path']))
+
+        not_uploaded = [pub for pub in publications if not pub.get('file_url')]
+        if not_uploaded:
+            logger.warning(f"⚠️ {len(not_uploaded)} publicações ficaram sem URL e não serão salvas")
+        publications = [pub for pub in publications if pub.get('file_url')]
         
         logger.info(f"✅ Upload concluído. {len(uploaded_urls)} arquivos enviados para 0x0.st")
 
         logger.info("💾 Iniciando armazenamento no banco de dados")
+        db_manager = None
         try:
+            init_db()
             db_manager = DatabaseManager()
-            saved_count = db_manager.save_publications(publications)
+            with STAGE_SECONDS.time(stage="database"):
+                # Falhas sobem para o except: a marca d'água só avança depois de uma gravação bem-sucedida
+                saved_count = db_manager.save_publications(publications, raise_errors=True)
             logger.info(f"✅ Armazenamento concluído. {saved_count} publicações salvas")
+            if incremental:
+                advance_high_water_mark(db_manager, scraper, publications)
         except Exception as db_error:
             logger.warning(f"⚠️ Erro no banco de dados: {str(db_error)}")
             logger.info("📋 Continuando sem salvar no banco - dados disponíveis em memória")
             saved_count = len(publications)
+            db_manager = None
+
+        if db_manager is not None:
+            # Falhas na extração de texto não afetam o armazenamento; o que faltar é indexado na próxima execução
+            logger.info("🔎 Extraindo texto dos PDFs para a busca")
+            try:
+                with STAGE_SECONDS.time(stage="index"):
+                    TextExtractor().index_pending(db_manager)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro na indexação de texto: {str(e)}")
 
         end_time = datetime.now()
         duration = end_time - start_time
@@ -75,6 +160,112 @@ def run_full_process(headless=True):
         import traceback
         logger.error(traceback.format_exc())
         return False
+    finally:
+        export_run_metrics(logger)
+
+def run_staged_process(headless=True, engine="http", download_workers=None, max_publications=None,
+                       incremental=False, resume=False):
+    try:
+        from pipeline import StagedPipeline
+
+        high_water_mark = load_high_water_mark() if incremental else None
+        pipeline = StagedPipeline(
+            headless=headless,
+            engine=engine,
+            download_workers=download_workers,
+            max_publications=max_publications,
+            high_water_mark=high_water_mark,
+            incremental=incremental,
+        )
+        return pipeline.run(resume=resume)
+    except Exception as e:
+        logger.error(f"❌ Erro durante a execução do pipeline em etapas: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+    finally:
+        export_run_metrics(logger)
+
+def run_sharded_process(start_date, end_date, granularity="week", workers=None, headless=True, engine="http",
+                        download_workers=None, max_publications=None, incremental=False):
+    try:
+        from sharding import run_sharded
+
+        if incremental:
+            logger.info("🔖 Modo incremental ignorado: o período dos shards é explícito")
+        summary = run_sharded(
+            start_date,
+            end_date,
+            granularity=granularity,
+            workers=workers,
+            engine=engine,
+            headless=headless,
+            max_publications=max_publications,
+            download_workers=download_workers,
+        )
+        return summary["success"]
+    except Exception as e:
+        logger.error(f"❌ Erro durante o scraping distribuído: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+
+def run_shard_worker_only(headless=True, engine="http", max_publications=None):
+    from sharding import run_shard_worker
+
+    logger.info("🧩 Iniciando worker de shards")
+    run_shard_worker(engine=engine, headless=headless, max_publications=max_publications)
+    return True
+
+def run_backfill_process(start_competence, end_competence, workers=None, headless=True, engine="http",
+                         download_workers=None, max_publications=None, incremental=False):
+    try:
+        from backfill import run_backfill
+
+        if incremental:
+            logger.info("🔖 Modo incremental ignorado: o período das competências é explícito")
+        summary = run_backfill(
+            start_competence,
+            end_competence,
+            workers=workers,
+            engine=engine,
+            headless=headless,
+            download_workers=download_workers,
+            max_publications=max_publications,
+        )
+        return summary["success"]
+    except Exception as e:
+        logger.error(f"❌ Erro durante o backfill: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+
+def run_index_process(workers=None):
+    try:
+        init_db()
+        indexed = TextExtractor(workers=workers).index_pending(DatabaseManager())
+        logger.info(f"✅ Indexação concluída. {indexed} publicações indexadas")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Erro durante a indexação de texto: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+    finally:
+        export_run_metrics(logger)
+
+def parse_competence_arg(value):
+    try:
+        datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Competência inválida: {value} (use AAAA-MM)")
+    return value
+
+def parse_date_arg(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data inválida: {value} (use AAAA-MM-DD)")
 
 def run_api_only():
     try:
@@ -98,15 +289,60 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Scraping de publicações da Prefeitura de Natal")
     parser.add_argument("--api-only", action="store_true", help="Executa apenas a API")
     parser.add_argument("--no-headless", action="store_true", help="Executa o navegador em modo visível")
+    parser.add_argument("--engine", choices=["http", "selenium"], default=os.getenv("SCRAPER_ENGINE", "http"),
+                        help="Motor de scraping: http (sem navegador, Selenium como fallback) ou selenium")
+    parser.add_argument("--download-workers", type=int, help="Número de downloads simultâneos (padrão: DOWNLOAD_WORKERS ou 8)")
+    parser.add_argument("--max-publications", type=int, help="Limita a quantidade de publicações baixadas")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Busca apenas publicações mais novas que a última registrada no banco")
+    parser.add_argument("--staged", action="store_true",
+                        help="Executa o pipeline em etapas, com checkpoint de cada publicação no banco")
+    parser.add_argument("--resume", action="store_true",
+                        help="Com --staged, apenas retoma os itens pendentes da fila, sem nova listagem")
+
+    subparsers = parser.add_subparsers(dest="command")
+    shard_parser = subparsers.add_parser("shard", help="Divide um período em shards e processa em paralelo")
+    shard_parser.add_argument("--from", dest="start_date", type=parse_date_arg, required=True, help="Data inicial (AAAA-MM-DD)")
+    shard_parser.add_argument("--to", dest="end_date", type=parse_date_arg, required=True, help="Data final (AAAA-MM-DD)")
+    shard_parser.add_argument("--granularity", choices=["day", "week", "month"], default="week",
+                              help="Tamanho de cada shard (padrão: week)")
+    shard_parser.add_argument("--workers", type=int, help="Processos de listagem simultâneos (padrão: SHARD_WORKERS ou 4)")
+    backfill_parser = subparsers.add_parser("backfill", help="Reprocessa competências históricas em paralelo")
+    backfill_parser.add_argument("--from", dest="start_competence", type=parse_competence_arg, required=True,
+                                 help="Competência inicial (AAAA-MM)")
+    backfill_parser.add_argument("--to", dest="end_competence", type=parse_competence_arg, required=True,
+                                 help="Competência final, inclusive (AAAA-MM)")
+    backfill_parser.add_argument("--workers", type=int, help="Competências listadas em paralelo (padrão: BACKFILL_WORKERS ou 4)")
+    subparsers.add_parser("shard-worker", help="Processa shards pendentes da tabela de leases (para containers adicionais)")
+    index_parser = subparsers.add_parser("index", help="Extrai o texto dos PDFs já baixados que ainda não estão na busca")
+    index_parser.add_argument("--workers", type=int, help="Processos de extração (padrão: TEXT_EXTRACTION_WORKERS ou nº de CPUs)")
     
     args = parser.parse_args()
     
     if args.api_only:
         run_api_only()
     else:
-        success = run_full_process(headless=not args.no_headless)
+        options = {
+            "headless": not args.no_headless,
+            "engine": args.engine,
+            "download_workers": args.download_workers,
+            "max_publications": args.max_publications,
+            "incremental": args.incremental,
+        }
+        if args.command == "shard":
+            success = run_sharded_process(args.start_date, args.end_date, args.granularity, args.workers, **options)
+        elif args.command == "backfill":
+            success = run_backfill_process(args.start_competence, args.end_competence, args.workers, **options)
+        elif args.command == "index":
+            success = run_index_process(args.workers)
+        elif args.command == "shard-worker":
+            success = run_shard_worker_only(options["headless"], options["engine"], options["max_publications"])
+        elif args.staged:
+            success = run_staged_process(resume=args.resume, **options)
+        else:
+            success = run_full_process(**options)
         if success:
             print("\n🎉 PROCESSO CONCLUÍDO COM SUCESSO! 🎉")
         else:
             print("\n❌ PROCESSO FALHOU - Verifique os logs acima")
-            sys.exit(1)
\ No newline at end of file
+            sys.exit(1)
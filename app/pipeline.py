@@ -0,0 +1,212 @@
+import os
+import logging
+from datetime import datetime
+
+from services import BaseScraper, PrefeituraScraper, HttpPrefeituraScraper, FileUploader0x0st, TextExtractor, UploadIndex
+from services.downloader import ConcurrentDownloader
+from core import DatabaseManager, JobQueue
+from core.job_queue import STAGE_DISCOVERED, STAGE_DOWNLOADED, STAGE_UPLOADED, STAGE_PERSISTED
+from core.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+class StagedPipeline:
+    """Pipeline em etapas com checkpoint no banco: cada publicação avança por
+    discovered -> downloaded -> uploaded -> persisted. Ao reiniciar, o trabalho
+    já concluído (downloads, uploads) não é refeito; apenas os itens pendentes
+    de cada etapa são processados."""
+
+    def __init__(self, headless=True, engine="http", download_workers=None, max_publications=None,
+                 high_water_mark=None, incremental=False, date_range=None, batch_size=None, queue=None,
+                 browser_pool=None):
+        self.headless = headless
+        self.engine = engine
+        self.download_workers = download_workers
+        self.max_publications = max_publications
+        self.high_water_mark = high_water_mark
+        self.incremental = incremental
+        self.date_range = date_range
+        self.browser_pool = browser_pool
+        self.batch_size = batch_size or int(os.getenv("PIPELINE_BATCH_SIZE", "50"))
+        self.queue = queue or JobQueue()
+        # Preenchidos pela listagem; numa retomada (sem listagem) a marca d'água não avança
+        self.discovered = None
+        self.truncated = False
+        self.stats = {"discovered": 0, "downloaded": 0, "bytes": 0, "uploaded": 0, "persisted": 0, "indexed": 0}
+
+    def discover(self):
+        options = {
+            "max_publications": self.max_publications,
+            "high_water_mark": self.high_water_mark,
+            "date_range": self.date_range,
+        }
+        scraper = None
+        publications = []
+        http_error = None
+        if self.engine == "http":
+            scraper = HttpPrefeituraScraper(**options)
+            try:
+                publications = scraper.discover()
+            except Exception as e:
+                logger.warning(f"⚠️ Erro na listagem via HTTP: {str(e)}")
+                http_error = e
+            finally:
+                scraper.close()
+            # Listagem vazia só é legítima (modo incremental ou período explícito, ex.: shard de um
+            # domingo) se foi lida até o fim; uma falha no meio da paginação não prova que não há nada
+            listing_complete = scraper.listing_fetched and http_error is None
+            if not publications and not ((self.high_water_mark or self.date_range) and listing_complete):
+                logger.warning("⚠️ Motor HTTP não retornou publicações, usando Selenium como fallback")
+                scraper = None
+
+        if scraper is None:
+            scraper = PrefeituraScraper(headless=self.headless, browser_pool=self.browser_pool, **options)
+            try:
+                publications = scraper.discover()
+            finally:
+                scraper.close()
+            if not publications and http_error is not None:
+                # Selenium também vazio depois de uma falha via HTTP: o período não pode ser dado como
+                # concluído (o shard volta para a fila via leases.fail)
+                raise http_error
+
+        self.discovered = publications
+        limited = scraper.limit_publications(publications)
+        self.truncated = scraper.truncated
+        discovered = self.queue.enqueue(limited)
+        self.stats["discovered"] += discovered
+        return discovered
+
+    def download_stage(self):
+        # Cada item é tentado no máximo uma vez por execução; falhas ficam para a próxima
+        total = 0
+        stage_started = datetime.utcnow()
+        downloader = ConcurrentDownloader(workers=self.download_workers)
+        BaseScraper.DOWNLOAD_PATH.mkdir(exist_ok=True)
+        try:
+            while True:
+                jobs = self.queue.claim(STAGE_DISCOVERED, self.batch_size, claimed_before=stage_started)
+                if not jobs:
+                    break
+                downloaded, failed = downloader.download_all(jobs, BaseScraper.build_file_path)
+                for job in downloaded:
+                    self.queue.advance(job["job_id"], STAGE_DOWNLOADED,
+                                       file_path=job["file_path"], checksum=job.get("checksum"))
+                    self.stats["bytes"] += os.path.getsize(job["file_path"])
+                for job in failed:
+                    self.queue.fail(job["job_id"], "download falhou")
+                total += len(downloaded)
+        finally:
+            downloader.close()
+        self.stats["downloaded"] += total
+        return total
+
+    def upload_stage(self):
+        total = 0
+        stage_started = datetime.utcnow()
+        uploader = FileUploader0x0st(index=UploadIndex(self.queue.db_url))
+        try:
+            while True:
+                jobs = self.queue.claim(STAGE_DOWNLOADED, self.batch_size, claimed_before=stage_started)
+                if not jobs:
+                    break
+                missing = [job for job in jobs if not os.path.exists(job["file_path"])]
+                for job in missing:
+                    # Arquivo local perdido: volta para a etapa de download
+                    self.queue.advance(job["job_id"], STAGE_DISCOVERED, file_path=None, checksum=None)
+                jobs = [job for job in jobs if job not in missing]
+
+                checksums = {job["file_path"]: job["checksum"] for job in jobs if job.get("checksum")}
+                # URLs simuladas não são checkpoint: o item falha e é reenviado na próxima execução
+                uploaded_urls = uploader.upload_multiple_files([job["file_path"] for job in jobs], checksums=checksums,
+                                                               allow_simulated=False)
+                for job in jobs:
+                    url = uploaded_urls.get(job["file_path"])
+                    if url:
+                        self.queue.advance(job["job_id"], STAGE_UPLOADED, file_url=url)
+                        total += 1
+                    else:
+                        self.queue.fail(job["job_id"], "upload falhou")
+        finally:
+            uploader.close()
+        self.stats["uploaded"] += total
+        return total
+
+    def persist_stage(self):
+        persisted = []
+        stage_started = datetime.utcnow()
+        db_manager = DatabaseManager(self.queue.db_url)
+        while True:
+            jobs = self.queue.claim(STAGE_UPLOADED, self.batch_size, claimed_before=stage_started)
+            if not jobs:
+                break
+            try:
+                db_manager.save_publications(jobs, raise_errors=True)
+            except Exception as e:
+                for job in jobs:
+                    self.queue.fail(job["job_id"], e)
+                continue
+            for job in jobs:
+                self.queue.advance(job["job_id"], STAGE_PERSISTED)
+            persisted.extend(jobs)
+
+        if persisted and self.incremental:
+            self.advance_high_water_mark(db_manager, persisted)
+        self.stats["persisted"] += len(persisted)
+        return len(persisted)
+
+    def advance_high_water_mark(self, db_manager, persisted):
+        if self.discovered is None:
+            logger.info("🔖 Retomada sem listagem; marca d'água mantida")
+            return None
+        if self.truncated:
+            logger.warning("⚠️ Listagem cortada por --max-publications; marca d'água mantida")
+            return None
+        return db_manager.update_high_water_mark(persisted, discovered=self.discovered)
+
+    def index_stage(self):
+        # Falhas na extração de texto não bloqueiam o pipeline; o que faltar é indexado na próxima execução
+        try:
+            indexed = TextExtractor().index_pending(DatabaseManager(self.queue.db_url))
+        except Exception as e:
+            logger.warning(f"⚠️ Erro na indexação de texto: {str(e)}")
+            indexed = 0
+        self.stats["indexed"] += indexed
+        return indexed
+
+    def run(self, resume=False):
+        start_time = datetime.now()
+        logger.info(f"🚀 Iniciando pipeline em etapas às {start_time}")
+
+        if resume:
+            logger.info("⏯️ Retomando itens pendentes, sem nova listagem")
+            self.queue.reset_attempts()
+        else:
+            logger.info(f"🔍 Listando publicações (motor: {self.engine})")
+            with STAGE_SECONDS.time(stage="scrape"):
+                self.discover()
+
+        logger.info(f"📋 Fila: {self.queue.counts()}")
+        with STAGE_SECONDS.time(stage="download"):
+            downloaded = self.download_stage()
+        logger.info(f"✅ {downloaded} arquivos baixados")
+        with STAGE_SECONDS.time(stage="upload"):
+            uploaded = self.upload_stage()
+        logger.info(f"✅ {uploaded} arquivos enviados para 0x0.st")
+        with STAGE_SECONDS.time(stage="database"):
+            persisted = self.persist_stage()
+        logger.info(f"✅ {persisted} publicações registradas no banco")
+        with STAGE_SECONDS.time(stage="index"):
+            self.index_stage()
+
+        counts = self.queue.counts()
+        exhausted = self.queue.exhausted()
+        logger.info(f"📋 Fila: {counts}")
+        if exhausted:
+            logger.warning(f"⚠️ {exhausted} itens esgotaram as tentativas e precisam de atenção")
+
+        logger.info(f"🎉 Pipeline concluído em {datetime.now() - start_time}")
+        pending = sum(count for stage, count in counts.items() if stage != STAGE_PERSISTED)
+        if pending:
+            logger.warning(f"⚠️ {pending} publicações pendentes; execute novamente com --staged --resume")
+        return pending == 0
@@ -2,16 +2,34 @@
 Serviços do sistema de scraping da Prefeitura de Natal.
 
 Este pacote contém os serviços principais:
+- base_scraper: Base comum dos motores de scraping (período, marca d'água, listagem)
 - scraper: Web scraping com Selenium do site da prefeitura
+- http_scraper: Motor de scraping via HTTP, sem navegador
+- browser_pool: Pool de navegadores Chrome reutilizáveis
+- debug_artifacts: Screenshots e dumps de HTML opcionais para depuração
 - uploader: Upload de arquivos para 0x0.st conforme especificação do desafio
+- upload_index: Índice SHA-256 -> URL para não reenviar arquivos já publicados
+- text_extraction: Extração do texto dos PDFs para a busca textual
 """
 
+from .base_scraper import BaseScraper
 from .scraper import PrefeituraScraper
+from .http_scraper import HttpPrefeituraScraper
+from .browser_pool import BrowserPool
+from .debug_artifacts import DebugArtifacts
 from .uploader import FileUploader0x0st
+from .upload_index import UploadIndex
+from .text_extraction import TextExtractor
 
 __all__ = [
+    'BaseScraper',
     'PrefeituraScraper',
+    'HttpPrefeituraScraper',
+    'BrowserPool',
+    'DebugArtifacts',
     'FileUploader0x0st',
+    'UploadIndex',
+    'TextExtractor',
 ]
 
 __version__ = '1.0.0'
@@ -0,0 +1,141 @@
+import os
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .listing_parser import parse_listing, find_page_urls
+
+from core.metrics import PAGE_LOAD_SECONDS, PARSE_SECONDS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+class BaseScraper:
+    """Base comum dos motores de scraping (HTTP e Selenium): período de busca,
+    filtro da marca d'água, leitura paralela das páginas da listagem e nomes dos
+    arquivos baixados. Os motores implementam ``discover``, ``run`` e ``close``."""
+    BASE_URL = "https://www.natal.rn.gov.br/dom"
+    DOWNLOAD_PATH = Path("downloads")
+
+    def __init__(self, max_publications=None, download_workers=None, high_water_mark=None, date_range=None):
+        self.high_water_mark = high_water_mark
+        self.date_range = date_range
+        if max_publications is None and os.getenv("SCRAPER_MAX_PUBLICATIONS"):
+            max_publications = int(os.getenv("SCRAPER_MAX_PUBLICATIONS"))
+        self.max_publications = max_publications
+        # Tudo o que a listagem trouxe e se ela foi cortada por max_publications: a marca
+        # d'água não pode passar do que foi listado e não chegou ao banco
+        self.discovered = []
+        self.truncated = False
+        self.download_workers = download_workers
+        self.pagination_workers = int(os.getenv("SCRAPER_PAGINATION_WORKERS", "4"))
+        self.setup_download_path()
+
+    def setup_download_path(self):
+        self.DOWNLOAD_PATH.mkdir(exist_ok=True)
+        logger.info(f"Diretório de downloads configurado: {self.DOWNLOAD_PATH}")
+
+    def limit_publications(self, publications):
+        if self.max_publications and len(publications) > self.max_publications:
+            logger.info(f"Limitando a {self.max_publications} publicações para download (de {len(publications)} encontradas)")
+            self.truncated = True
+            return publications[:self.max_publications]
+        return publications
+
+    def get_last_month_date_range(self):
+        today = datetime.now()
+        first_day_of_current_month = today.replace(day=1)
+        last_day_of_previous_month = first_day_of_current_month - timedelta(days=1)
+        first_day_of_previous_month = last_day_of_previous_month.replace(day=1)
+        
+        return first_day_of_previous_month, last_day_of_previous_month
+
+    def get_search_date_range(self):
+        if self.date_range:
+            return self.date_range
+        if not self.high_water_mark:
+            return self.get_last_month_date_range()
+
+        # Modo incremental: reprocessa apenas a partir do dia da última publicação conhecida
+        start_date = self.high_water_mark["date"].replace(hour=0, minute=0, second=0, microsecond=0)
+        return start_date, datetime.now()
+
+    def filter_new_publications(self, publications):
+        if not self.high_water_mark:
+            return publications, False
+
+        last_date = self.high_water_mark["date"]
+        known_links = self.high_water_mark.get("links") or {self.high_water_mark.get("link")}
+        new_publications = [
+            pub for pub in publications
+            if pub["date"] >= last_date and pub["link"] not in known_links
+        ]
+        skipped = len(publications) - len(new_publications)
+        if skipped:
+            logger.info(f"{skipped} publicações já conhecidas ignoradas")
+        # Publicações do próprio dia da marca podem se intercalar com novas; a paginação
+        # só para quando a listagem chega a datas anteriores à marca
+        reached_known = any(pub["date"] < last_date for pub in publications)
+        if reached_known:
+            logger.info("Publicações anteriores à marca d'água alcançadas")
+        return new_publications, reached_known
+
+    def fetch_listing_page(self, session, url, engine, timeout=30):
+        with PAGE_LOAD_SECONDS.time(engine=engine):
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+            if "charset" not in response.headers.get("Content-Type", "").lower():
+                response.encoding = response.apparent_encoding
+            return response.text
+
+    def fetch_listing_pages(self, page_urls, fetch, engine):
+        """Busca as páginas ``[(número, url), ...]`` da listagem em paralelo, num
+        pool limitado a ``SCRAPER_PAGINATION_WORKERS``. No modo incremental as
+        páginas vão em lotes do tamanho do pool, para parar ao alcançar
+        publicações já conhecidas. Devolve ``(publicações, páginas lidas)``."""
+        all_publications = []
+        pending = list(page_urls)
+        seen = {number for number, _ in pending}
+        workers = max(1, self.pagination_workers)
+        pages = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending:
+                batch_size = workers if self.high_water_mark else len(pending)
+                batch, pending = pending[:batch_size], pending[batch_size:]
+                logger.info(f"Buscando {len(batch)} páginas em paralelo (páginas {batch[0][0]} a {batch[-1][0]})")
+                htmls = executor.map(fetch, [url for _, url in batch])
+                for (number, url), html in zip(batch, htmls):
+                    pages += 1
+                    with PARSE_SECONDS.time(engine=engine):
+                        publications = parse_listing(html, url)
+                    if not publications:
+                        logger.warning(f"Nenhuma publicação encontrada na página {number}")
+                        return all_publications, pages
+
+                    publications, reached_known = self.filter_new_publications(publications)
+                    all_publications.extend(publications)
+                    if reached_known:
+                        return all_publications, pages
+
+                    # Paginação exibida em janela (1 2 3 ... ): páginas além da última conhecida
+                    for next_number, next_url in find_page_urls(html, url):
+                        if next_number not in seen:
+                            seen.add(next_number)
+                            pending.append((next_number, next_url))
+                pending.sort()
+
+        return all_publications, pages
+
+    @classmethod
+    def build_file_path(cls, publication):
+        date_str = publication["date"].strftime("%Y-%m-%d")
+        sanitized_title = re.sub(r'[^\w\s-]', '', publication["title"])
+        sanitized_title = re.sub(r'[\s]+', '_', sanitized_title)
+        filename = f"{date_str}_{sanitized_title[:50]}.pdf"
+        return cls.DOWNLOAD_PATH / filename
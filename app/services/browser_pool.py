@@ -0,0 +1,249 @@
+import os
+import queue
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+CHROME_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+
+PROFILES = ["standard", "lean"]
+
+VIEWPORTS = {
+    "standard": (1920, 1080),
+    "lean": (1280, 800),
+}
+
+# Recursos que não influenciam a extração: imagens, fontes, mídia e analytics
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*clarity.ms*", "*vlibras.gov.br*",
+]
+
+LEAN_DISABLED_FEATURES = [
+    "Translate", "OptimizationHints", "MediaRouter", "InterestFeedContentSuggestions",
+    "CalculateNativeWinOcclusion", "AutofillServerCommunication",
+]
+
+def get_chrome_profile(profile=None):
+    profile = profile or os.getenv("SCRAPER_CHROME_PROFILE", "standard")
+    if profile not in PROFILES:
+        raise ValueError(f"Perfil do Chrome inválido: {profile}. Use {', '.join(PROFILES)}")
+    return profile
+
+def build_chrome_options(headless=True, download_dir="downloads", profile="standard"):
+    width, height = VIEWPORTS[profile]
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument(f"--window-size={width},{height}")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument(f"--user-agent={CHROME_USER_AGENT}")
+    prefs = {
+        "download.default_directory": str(Path(download_dir).absolute()),
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "plugins.always_open_pdf_externally": True,
+        "plugins.plugins_disabled": ["Chrome PDF Viewer"],
+    }
+
+    if profile == "lean":
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument(f"--disable-features={','.join(LEAN_DISABLED_FEATURES)}")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-background-timer-throttling")
+        chrome_options.add_argument("--disable-component-update")
+        chrome_options.add_argument("--disable-default-apps")
+        chrome_options.add_argument("--disable-sync")
+        chrome_options.add_argument("--disable-notifications")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--no-first-run")
+        prefs.update({
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.geolocation": 2,
+        })
+    else:
+        chrome_options.add_argument("--start-maximized")
+
+    chrome_options.add_experimental_option("prefs", prefs)
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    return chrome_options
+
+def create_driver(headless=True, download_dir="downloads", profile=None):
+    profile = get_chrome_profile(profile)
+    width, height = VIEWPORTS[profile]
+    driver = webdriver.Chrome(options=build_chrome_options(headless, download_dir, profile))
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', {
+        'mobile': False,
+        'width': width,
+        'height': height,
+        'deviceScaleFactor': 1,
+    })
+    if profile == "lean":
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+    return driver
+
+class PooledBrowser:
+    def __init__(self, browser_id, driver, download_dir):
+        self.id = browser_id
+        self.driver = driver
+        self.download_dir = download_dir
+        self.pages = 0
+        self.tasks = 0
+
+    def __repr__(self):
+        return f"<PooledBrowser(id={self.id}, pages={self.pages}, tasks={self.tasks})>"
+
+class BrowserPool:
+    """Pool de instâncias do Chrome já inicializadas, compartilhadas entre tarefas
+    de scraping para não pagar o cold start do navegador a cada tarefa.
+
+    Cada navegador tem seu próprio diretório de downloads (``<base>/browser-<pid>-N``),
+    passa por um health check ao ser devolvido e é reciclado depois de
+    ``max_pages`` páginas carregadas."""
+
+    def __init__(self, size=None, headless=True, max_pages=None, download_dir="downloads", profile=None):
+        self.size = size or int(os.getenv("BROWSER_POOL_SIZE", "2"))
+        self.headless = headless
+        self.profile = get_chrome_profile(profile)
+        self.max_pages = max_pages or int(os.getenv("BROWSER_POOL_MAX_PAGES", "200"))
+        self.download_dir = Path(download_dir)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._free_ids = list(range(self.size, 0, -1))
+        self._closed = False
+
+    def _launch(self, browser_id):
+        # O PID evita colisão entre pools de processos diferentes (ex.: workers de shards)
+        download_dir = self.download_dir / f"browser-{os.getpid()}-{browser_id}"
+        download_dir.mkdir(parents=True, exist_ok=True)
+        driver = create_driver(self.headless, download_dir, self.profile)
+        logger.info(f"🌐 Navegador {browser_id} iniciado (perfil {self.profile}, downloads em {download_dir})")
+        return PooledBrowser(browser_id, driver, download_dir)
+
+    def warm(self, count=None):
+        """Inicia navegadores antecipadamente, até ``count`` (padrão: todo o pool)."""
+        for _ in range(min(count or self.size, self.size)):
+            with self._lock:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+                browser_id = self._free_ids.pop()
+            try:
+                self._idle.put(self._launch(browser_id))
+            except Exception:
+                self._discard_id(browser_id)
+                raise
+
+    def _discard_id(self, browser_id):
+        with self._lock:
+            self._created -= 1
+            self._free_ids.append(browser_id)
+
+    def is_healthy(self, browser):
+        try:
+            browser.driver.execute_script("return 1")
+            return bool(browser.driver.window_handles)
+        except Exception as e:
+            logger.warning(f"Navegador {browser.id} não respondeu ao health check: {str(e)}")
+            return False
+
+    def _quit(self, browser):
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+        self._discard_id(browser.id)
+
+    def acquire(self, timeout=None):
+        if self._closed:
+            raise RuntimeError("Pool de navegadores encerrado")
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                browser = None
+
+            if browser is None:
+                with self._lock:
+                    can_launch = self._created < self.size
+                    if can_launch:
+                        self._created += 1
+                        browser_id = self._free_ids.pop()
+                if can_launch:
+                    try:
+                        browser = self._launch(browser_id)
+                    except Exception:
+                        self._discard_id(browser_id)
+                        raise
+                else:
+                    browser = self._idle.get(timeout=timeout)
+
+            if self.is_healthy(browser):
+                browser.tasks += 1
+                return browser
+            self._quit(browser)
+
+    def release(self, browser, pages=0, healthy=True):
+        browser.pages += pages
+        if self._closed or not healthy or not self.is_healthy(browser):
+            self._quit(browser)
+            return
+        if browser.pages >= self.max_pages:
+            logger.info(f"♻️ Reciclando navegador {browser.id} após {browser.pages} páginas")
+            self._quit(browser)
+            return
+        try:
+            # Libera memória da última página antes de devolver ao pool
+            browser.driver.get("about:blank")
+        except Exception:
+            self._quit(browser)
+            return
+        self._idle.put(browser)
+
+    @contextmanager
+    def browser(self, timeout=None):
+        browser = self.acquire(timeout=timeout)
+        try:
+            yield browser
+        finally:
+            self.release(browser)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(browser)
+        logger.info("🌐 Pool de navegadores encerrado")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
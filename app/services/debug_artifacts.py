@@ -0,0 +1,98 @@
+import os
+import random
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+MODES = ["off", "sample", "on_failure", "always"]
+
+class DebugArtifacts:
+    """Screenshots e dumps de HTML para depuração do scraper.
+
+    Modos (``SCRAPER_DEBUG_ARTIFACTS``):
+    - ``off`` (padrão): nada é gravado;
+    - ``on_failure``: apenas capturas marcadas como falha;
+    - ``sample``: falhas e uma fração (``SCRAPER_DEBUG_SAMPLE_RATE``) das demais;
+    - ``always``: todas as capturas.
+
+    Os arquivos vão para um diretório próprio (``SCRAPER_DEBUG_DIR``), fora de
+    ``downloads/``, e os mais antigos são removidos quando o diretório passa de
+    ``SCRAPER_DEBUG_MAX_FILES`` arquivos ou ``SCRAPER_DEBUG_MAX_MB`` megabytes."""
+
+    def __init__(self, mode=None, directory=None, sample_rate=None, max_files=None, max_mb=None):
+        self.mode = mode or os.getenv("SCRAPER_DEBUG_ARTIFACTS", "off")
+        if self.mode not in MODES:
+            raise ValueError(f"Modo de artefatos de depuração inválido: {self.mode}. Use {', '.join(MODES)}")
+        self.directory = Path(directory or os.getenv("SCRAPER_DEBUG_DIR", "debug_artifacts"))
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv("SCRAPER_DEBUG_SAMPLE_RATE", "0.1"))
+        self.max_files = max_files or int(os.getenv("SCRAPER_DEBUG_MAX_FILES", "200"))
+        self.max_bytes = (max_mb or float(os.getenv("SCRAPER_DEBUG_MAX_MB", "100"))) * 1024 * 1024
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def should_capture(self, failure=False):
+        if self.mode == "always":
+            return True
+        if self.mode in ("on_failure", "sample") and failure:
+            return True
+        if self.mode == "sample":
+            return random.random() < self.sample_rate
+        return False
+
+    def _path(self, name, suffix):
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)[:60]
+        return self.directory / f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{safe_name}{suffix}"
+
+    def capture(self, driver, name, failure=False, screenshot=True, html=False):
+        """Grava screenshot e/ou HTML da página atual se o modo permitir.
+        Devolve os caminhos gravados (lista vazia quando nada foi capturado)."""
+        if not driver or not self.should_capture(failure):
+            return []
+
+        saved = []
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if screenshot:
+                path = self._path(name, ".png")
+                if driver.save_screenshot(str(path)):
+                    saved.append(path)
+            if html:
+                path = self._path(name, ".html")
+                path.write_text(driver.page_source, encoding="utf-8")
+                saved.append(path)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar artefato de depuração '{name}': {str(e)}")
+
+        if saved:
+            logger.info(f"🐞 Artefato de depuração salvo: {', '.join(path.name for path in saved)}")
+            self.rotate()
+        return saved
+
+    def rotate(self):
+        with self._lock:
+            try:
+                files = sorted(
+                    (path for path in self.directory.iterdir() if path.is_file()),
+                    key=lambda path: path.stat().st_mtime,
+                )
+                sizes = {path: path.stat().st_size for path in files}
+            except OSError:
+                return
+            total = sum(sizes.values())
+            while files and (len(files) > self.max_files or total > self.max_bytes):
+                oldest = files.pop(0)
+                total -= sizes[oldest]
+                try:
+                    oldest.unlink()
+                except OSError:
+                    pass
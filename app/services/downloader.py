@@ -0,0 +1,168 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .listing_parser import find_pdf_link
+from .streaming import CHUNK_SIZE, stream_to_file, file_sha256
+
+from core.metrics import DOWNLOAD_SECONDS, DOWNLOAD_BYTES
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+
+
+def create_session(pool_size=10, retry=True):
+    """Sessão com pool de conexões. Com ``retry=False`` o adapter não repete
+    nada (nem falhas de conexão), para quem já tem o próprio laço de tentativas."""
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "HEAD"],
+    ) if retry else Retry(total=0, read=False, redirect=False)
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retries,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+class HostRateLimiter:
+    """Espaçamento mínimo entre requisições para um mesmo host, compartilhado
+    entre todas as threads de download."""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second and requests_per_second > 0 else 0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Aguarda a vez do host e devolve os segundos de espera."""
+        if not self.interval:
+            return 0.0
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+
+class ConcurrentDownloader:
+    """Baixa publicações em paralelo com ``DOWNLOAD_WORKERS`` threads.
+
+    ``DOWNLOAD_RATE_PER_HOST`` (padrão 4, ``0`` desliga) é o máximo de
+    publicações por segundo iniciadas em cada host. O limite conta uma vez por
+    publicação: o PDF encontrado na página da publicação é pedido em seguida,
+    sem nova espera."""
+
+    CHUNK_SIZE = CHUNK_SIZE
+
+    def __init__(self, workers=None, rate_per_host=None, timeout=None, session=None):
+        self.workers = workers or int(os.getenv("DOWNLOAD_WORKERS", "8"))
+        rate_per_host = rate_per_host if rate_per_host is not None else float(os.getenv("DOWNLOAD_RATE_PER_HOST", "4"))
+        self.rate_limiter = HostRateLimiter(rate_per_host)
+        self.timeout = timeout or int(os.getenv("HTTP_TIMEOUT", "30"))
+        self.session = session or create_session(pool_size=self.workers)
+        self._queued = threading.local()
+
+    def get(self, url, throttle=True):
+        # Espera no limitador por host não é tempo de transferência; fica fora de DOWNLOAD_SECONDS
+        if throttle:
+            self._queued.seconds = getattr(self._queued, "seconds", 0.0) + self.rate_limiter.wait(url)
+        response = self.session.get(url, timeout=self.timeout, stream=True)
+        response.raise_for_status()
+        return response
+
+    def download(self, url, file_path):
+        response = self.get(url)
+
+        if "pdf" not in response.headers.get("Content-Type", "").lower():
+            pdf_url = find_pdf_link(response.text, response.url)
+            response.close()
+            if not pdf_url:
+                logger.warning(f"Nenhum link de PDF encontrado em: {url}")
+                return None
+            logger.info(f"Encontrado link direto para PDF: {pdf_url}")
+            response = self.get(pdf_url, throttle=False)
+
+        with response:
+            return stream_to_file(response, file_path, chunk_size=self.CHUNK_SIZE)
+
+    def download_publication(self, publication, file_path):
+        if file_path.exists():
+            logger.info(f"Arquivo já existe: {file_path.name}")
+            publication["checksum"] = file_sha256(file_path)
+            return str(file_path)
+
+        outcome = "error"
+        self._queued.seconds = 0.0
+        start = time.perf_counter()
+        try:
+            result = self.download(publication["link"], file_path)
+            if not result:
+                outcome = "no_pdf"
+                return None
+            publication["checksum"], size = result
+            outcome = "ok"
+            DOWNLOAD_BYTES.inc(size)
+            logger.info(f"PDF baixado via HTTP: {file_path.name} ({size / (1024 * 1024):.2f} MB)")
+            return str(file_path)
+        except Exception as e:
+            logger.error(f"Erro ao baixar publicação via HTTP: {str(e)}")
+            return None
+        finally:
+            DOWNLOAD_SECONDS.observe(time.perf_counter() - start - self._queued.seconds, result=outcome)
+
+    def download_all(self, publications, path_builder):
+        """Baixa as publicações em paralelo e devolve ``(baixadas, falhas)``,
+        preenchendo ``file_path`` nas publicações baixadas."""
+        downloaded = []
+        failed = []
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="download") as executor:
+            futures = {
+                executor.submit(self.download_publication, pub, path_builder(pub)): pub
+                for pub in publications
+            }
+            for future in as_completed(futures):
+                pub = futures[future]
+                file_path = future.result()
+                if file_path:
+                    pub["file_path"] = file_path
+                    downloaded.append(pub)
+                else:
+                    failed.append(pub)
+
+        order = {id(pub): i for i, pub in enumerate(publications)}
+        downloaded.sort(key=lambda pub: order[id(pub)])
+        failed.sort(key=lambda pub: order[id(pub)])
+
+        elapsed = time.monotonic() - start
+        logger.info(f"{len(downloaded)}/{len(publications)} publicações baixadas em {elapsed:.2f}s "
+                    f"com {self.workers} workers")
+        return downloaded, failed
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,134 @@
+import os
+import logging
+from urllib.parse import urlencode
+
+from .base_scraper import BaseScraper
+from .downloader import ConcurrentDownloader, create_session
+from .listing_parser import parse_listing, find_next_page_url, find_page_urls
+
+from core.metrics import PARSE_SECONDS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+class HttpPrefeituraScraper(BaseScraper):
+    """Motor de scraping sem navegador: envia o filtro de datas e lê a listagem
+    diretamente por HTTP, reaproveitando conexões de um pool de sessões."""
+
+    def __init__(self, pool_size=None, timeout=None, download_workers=None, max_publications=None,
+                 high_water_mark=None, date_range=None):
+        super().__init__(
+            max_publications=max_publications,
+            download_workers=download_workers,
+            high_water_mark=high_water_mark,
+            date_range=date_range,
+        )
+        self.pool_size = pool_size or int(os.getenv("HTTP_POOL_SIZE", "10"))
+        self.timeout = timeout or int(os.getenv("HTTP_TIMEOUT", "30"))
+        self.session = create_session(pool_size=self.pool_size)
+        self.listing_fetched = False
+
+    def build_search_url(self, start_date, end_date):
+        query = urlencode({
+            "dataInicial": start_date.strftime("%d/%m/%Y"),
+            "dataFinal": end_date.strftime("%d/%m/%Y"),
+        })
+        return f"{self.BASE_URL}/pesquisa?{query}"
+
+    def fetch_page(self, url):
+        return self.fetch_listing_page(self.session, url, "http", self.timeout)
+
+    def fetch_listing(self, start_date, end_date):
+        url = self.build_search_url(start_date, end_date)
+        logger.info(f"Processando página 1: {url}")
+        html = self.fetch_page(url)
+        self.listing_fetched = True
+        with PARSE_SECONDS.time(engine="http"):
+            publications = parse_listing(html, url)
+        if not publications:
+            logger.warning("Nenhuma publicação encontrada na página 1")
+            return []
+
+        all_publications, reached_known = self.filter_new_publications(publications)
+        page = 1
+        if not reached_known:
+            page_urls = find_page_urls(html, url)
+            if page_urls:
+                logger.info(f"Paginação direta: {len(page_urls) + 1} páginas encontradas")
+                publications, pages = self.fetch_listing_pages(page_urls, self.fetch_page, "http")
+                all_publications.extend(publications)
+                page += pages
+            else:
+                publications, pages = self.follow_next_pages(html, url)
+                all_publications.extend(publications)
+                page += pages
+
+        logger.info(f"Total de {len(all_publications)} publicações encontradas em {page} páginas")
+        return all_publications
+
+    def follow_next_pages(self, html, url):
+        """Sem paginação numerada: segue o link 'próximo' página a página."""
+        all_publications = []
+        visited = {url}
+        pages = 0
+        url = find_next_page_url(html, url)
+
+        while url and url not in visited:
+            visited.add(url)
+            pages += 1
+            logger.info(f"Processando página {pages + 1}: {url}")
+            html = self.fetch_page(url)
+            with PARSE_SECONDS.time(engine="http"):
+                publications = parse_listing(html, url)
+            if not publications:
+                logger.warning(f"Nenhuma publicação encontrada na página {pages + 1}")
+                break
+
+            publications, reached_known = self.filter_new_publications(publications)
+            all_publications.extend(publications)
+            if reached_known:
+                break
+            url = find_next_page_url(html, url)
+
+        return all_publications, pages
+
+    def download_publication(self, publication):
+        downloader = ConcurrentDownloader(workers=1, timeout=self.timeout, session=self.session)
+        return downloader.download_publication(publication, self.build_file_path(publication))
+
+    def discover(self):
+        first_day, last_day = self.get_search_date_range()
+        logger.info(f"Período de busca: {first_day.strftime('%d/%m/%Y')} a {last_day.strftime('%d/%m/%Y')}")
+        return self.fetch_listing(first_day, last_day)
+
+    def close(self):
+        self.session.close()
+
+    def run(self):
+        """Lista e baixa as publicações. Erros da listagem sobem para o chamador:
+        uma falha no meio da paginação não pode ser confundida com "nada novo"."""
+        try:
+            logger.info("Iniciando processo de scraping via HTTP")
+            publications = self.discover()
+            self.discovered = publications
+            if not publications:
+                if self.high_water_mark:
+                    logger.info("Nenhuma publicação nova desde a última execução")
+                else:
+                    logger.warning("Nenhuma publicação encontrada via HTTP")
+                return []
+
+            publications = self.limit_publications(publications)
+
+            downloader = ConcurrentDownloader(workers=self.download_workers, timeout=self.timeout, session=self.session)
+            result, failed = downloader.download_all(publications, self.build_file_path)
+            if failed:
+                logger.warning(f"{len(failed)} publicações não puderam ser baixadas via HTTP")
+
+            logger.info(f"Processo de scraping via HTTP concluído. {len(result)} arquivos baixados.")
+            return result
+        finally:
+            self.close()
@@ -0,0 +1,180 @@
+import logging
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMATS = ["%d/%m/%Y", "%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d.%m.%Y"]
+NEXT_PAGE_LABELS = ["próximo", "próxima", "next"]
+PAGE_PARAMS = ["page", "pagina", "p"]
+
+
+def parse_publication_date(date_str):
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+    logger.error(f"Não foi possível converter a data: {date_str}, usando data atual")
+    return datetime.now()
+
+
+class ListingTableParser(HTMLParser):
+    """Percorre o HTML da listagem uma única vez, coletando tabelas e links."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self.anchors = []
+        self._table_depth = 0
+        self._row = None
+        self._cell = None
+        self._anchor = None
+        self._li_class = ""
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "table":
+            self._table_depth += 1
+            if self._table_depth == 1:
+                self.tables.append([])
+        elif tag == "tr" and self._table_depth == 1:
+            self._row = []
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = {"tag": tag, "text": [], "links": []}
+        elif tag == "li":
+            self._li_class = attrs.get("class") or ""
+        elif tag == "a":
+            self._anchor = {
+                "href": attrs.get("href"),
+                "class": " ".join([attrs.get("class") or "", self._li_class]).strip(),
+                "rel": attrs.get("rel") or "",
+                "disabled": "disabled" in attrs,
+                "text": [],
+            }
+            if self._cell is not None and attrs.get("href"):
+                self._cell["links"].append(attrs["href"])
+
+    def handle_endtag(self, tag):
+        if tag == "table" and self._table_depth:
+            self._table_depth -= 1
+        elif tag in ("td", "th") and self._cell is not None:
+            self._row.append(self._cell)
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            if self._cell is not None:
+                self._row.append(self._cell)
+                self._cell = None
+            self.tables[-1].append(self._row)
+            self._row = None
+        elif tag == "li":
+            self._li_class = ""
+        elif tag == "a" and self._anchor is not None:
+            self._anchor["text"] = " ".join("".join(self._anchor["text"]).split())
+            self.anchors.append(self._anchor)
+            self._anchor = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell["text"].append(data)
+        if self._anchor is not None:
+            self._anchor["text"].append(data)
+
+
+def _cell_text(cell):
+    return " ".join("".join(cell["text"]).split())
+
+
+def _parse(html):
+    parser = ListingTableParser()
+    parser.feed(html or "")
+    parser.close()
+    return parser
+
+
+def parse_listing(html, base_url):
+    """Extrai as publicações da tabela de resultados no mesmo formato de
+    ``PrefeituraScraper.get_publication_links``."""
+    parser = _parse(html)
+    publications = []
+
+    for table in parser.tables:
+        data_rows = [row for row in table if len([c for c in row if c["tag"] == "td"]) >= 3]
+        if not data_rows:
+            continue
+
+        for row_index, row in enumerate(data_rows, 1):
+            cells = [c for c in row if c["tag"] == "td"]
+            links = cells[2]["links"] or [link for cell in cells for link in cell["links"]]
+            if not links:
+                logger.error(f"Nenhum link encontrado na linha {row_index}, pulando")
+                continue
+
+            publication_date = parse_publication_date(_cell_text(cells[0]))
+            publications.append({
+                "date": publication_date,
+                "competence": publication_date.strftime("%Y-%m"),
+                "title": _cell_text(cells[1]),
+                "link": urljoin(base_url, links[0]),
+            })
+        break
+
+    logger.info(f"Extraídos {len(publications)} links de publicações")
+    return publications
+
+
+def find_next_page_url(html, base_url):
+    parser = _parse(html)
+    for anchor in parser.anchors:
+        if not anchor["href"] or anchor["href"].startswith(("#", "javascript:")):
+            continue
+        if anchor["disabled"] or "disabled" in anchor["class"]:
+            continue
+        text = anchor["text"].lower()
+        is_next = (
+            "next" in anchor["rel"].split()
+            or any(label in text for label in NEXT_PAGE_LABELS)
+            or "next" in anchor["class"].split()
+            or "pagination-next" in anchor["class"].split()
+        )
+        if is_next:
+            return urljoin(base_url, anchor["href"])
+    return None
+
+
+def find_page_urls(html, base_url):
+    """Descobre o modelo de URL e o total de páginas a partir dos links de
+    paginação numerada. Devolve ``[(número, url), ...]`` da página 2 em diante,
+    ou lista vazia quando a listagem não tem paginação por parâmetro."""
+    parser = _parse(html)
+    template = None
+    last_page = 1
+    for anchor in parser.anchors:
+        if not anchor["href"] or anchor["href"].startswith(("#", "javascript:")):
+            continue
+        url = urlparse(urljoin(base_url, anchor["href"]))
+        query = parse_qs(url.query, keep_blank_values=True)
+        for param in PAGE_PARAMS:
+            values = query.get(param)
+            if values and values[0].isdigit():
+                last_page = max(last_page, int(values[0]))
+                template = template or (url, query, param)
+                break
+
+    if not template:
+        return []
+    url, query, param = template
+    pages = []
+    for number in range(2, last_page + 1):
+        query[param] = [str(number)]
+        pages.append((number, urlunparse(url._replace(query=urlencode(query, doseq=True)))))
+    return pages
+
+
+def find_pdf_link(html, base_url):
+    parser = _parse(html)
+    for anchor in parser.anchors:
+        if anchor["href"] and ".pdf" in anchor["href"].lower():
+            return urljoin(base_url, anchor["href"])
+    return None
@@ -1,123 +1,108 @@
-import os
 import re
-import time
 import logging
 from datetime import datetime, timedelta
-from pathlib import Path
 
-from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 
+from .base_scraper import BaseScraper
+from .browser_pool import create_driver
+from .debug_artifacts import DebugArtifacts
+from .downloader import ConcurrentDownloader, create_session
+from .listing_parser import parse_listing, find_page_urls
+from .streaming import stream_to_file
+from .waits import ScraperWaits
+
+from core.metrics import PAGE_LOAD_SECONDS, PARSE_SECONDS
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
-class PrefeituraScraper:
-    BASE_URL = "https://www.natal.rn.gov.br/dom"
-    DOWNLOAD_PATH = Path("downloads")
-
-    def __init__(self, headless=True):
+class PrefeituraScraper(BaseScraper):
+    """Motor de scraping com Selenium: preenche o formulário do site num Chrome
+    real. Usado como fallback do motor HTTP e quando o site exige JavaScript."""
+
+    def __init__(self, headless=True, max_publications=None, download_workers=None, wait_timeouts=None,
+                 high_water_mark=None, date_range=None, browser_pool=None, chrome_profile=None):
+        super().__init__(
+            max_publications=max_publications,
+            download_workers=download_workers,
+            high_water_mark=high_water_mark,
+            date_range=date_range,
+        )
         self.headless = headless
+        self.chrome_profile = chrome_profile
         self.driver = None
-        self.setup_download_path()
-        
-    def setup_download_path(self):
-        self.DOWNLOAD_PATH.mkdir(exist_ok=True)
-        logger.info(f"Diretório de downloads configurado: {self.DOWNLOAD_PATH}")
+        self.browser_pool = browser_pool
+        self.browser = None
+        self.download_dir = self.DOWNLOAD_PATH
+        self.pages_loaded = 0
+        self.waits = ScraperWaits(wait_timeouts)
+        self.debug = DebugArtifacts()
 
     def init_driver(self):
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless=new")
-
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36")
-        prefs = {
-            "download.default_directory": str(self.DOWNLOAD_PATH.absolute()),
-            "download.prompt_for_download": False,
-            "download.directory_upgrade": True,
-            "plugins.always_open_pdf_externally": True,
-            "plugins.plugins_disabled": ["Chrome PDF Viewer"],
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            self.driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', {
-                'mobile': False,
-                'width': 1920,
-                'height': 1080,
-                'deviceScaleFactor': 1,
-            })
-            
+            if self.browser_pool:
+                self.browser = self.browser_pool.acquire()
+                self.driver = self.browser.driver
+                self.download_dir = self.browser.download_dir
+                logger.info(f"Driver do Selenium obtido do pool (navegador {self.browser.id})")
+                return
+            self.driver = create_driver(self.headless, self.DOWNLOAD_PATH, self.chrome_profile)
             logger.info("Driver do Selenium inicializado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao inicializar o driver: {str(e)}")
             raise
 
-    def get_last_month_date_range(self):
-        today = datetime.now()
-        first_day_of_current_month = today.replace(day=1)
-        last_day_of_previous_month = first_day_of_current_month - timedelta(days=1)
-        first_day_of_previous_month = last_day_of_previous_month.replace(day=1)
-        
-        return first_day_of_previous_month, last_day_of_previous_month
+    def load_page(self, url):
+        self.pages_loaded += 1
+        with PAGE_LOAD_SECONDS.time(engine="selenium"):
+            self.driver.get(url)
+
+    def download_publications(self, publications):
+        downloader = ConcurrentDownloader(workers=self.download_workers)
+        try:
+            if self.driver:
+                for cookie in self.driver.get_cookies():
+                    downloader.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"))
+            downloaded, failed = downloader.download_all(publications, self.build_file_path)
+        finally:
+            downloader.close()
+
+        for i, pub in enumerate(failed):
+            logger.info(f"Baixando via navegador {i+1}/{len(failed)}: {pub['title']}")
+            file_path = self.download_publication(pub)
+            if file_path:
+                pub["file_path"] = file_path
+                downloaded.append(pub)
+
+        return downloaded
 
     def navigate_to_site(self):
         try:
             logger.info(f"Navegando para: {self.BASE_URL}")
-            self.driver.get(self.BASE_URL)
+            self.load_page(self.BASE_URL)
             wait_strategies = [
                 (By.CSS_SELECTOR, "div.container"),
-                (By.TAG_NAME, "body"),
                 (By.CSS_SELECTOR, "main"),
                 (By.CSS_SELECTOR, "form"),
                 (By.TAG_NAME, "table")
             ]
             
-            page_loaded = False
-            for selector_type, selector_value in wait_strategies:
-                try:
-                    logger.info(f"Aguardando elemento: {selector_type}={selector_value}")
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((selector_type, selector_value))
-                    )
-                    logger.info(f"Elemento encontrado: {selector_type}={selector_value}")
-                    page_loaded = True
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not page_loaded:
+            if not self.waits.presence(self.driver, wait_strategies, step="page_load"):
                 logger.warning("Não foi possível confirmar carregamento da página usando seletores específicos")
-                time.sleep(10)
 
-            time.sleep(5)
+            self.waits.network_idle(self.driver)
 
             current_url = self.driver.current_url
             logger.info(f"URL atual: {current_url}")
 
-            screenshot_path = os.path.join(self.DOWNLOAD_PATH, "site_screenshot.png")
-            self.driver.save_screenshot(screenshot_path)
-            logger.info(f"Screenshot salvo em: {screenshot_path}")
+            self.debug.capture(self.driver, "site")
             
             logger.info(f"Navegação para {self.BASE_URL} realizada com sucesso")
         except Exception as e:
@@ -131,7 +116,7 @@ class PrefeituraScraper:
             
             logger.info(f"Tentando configurar datas: {start_date_str} a {end_date_str}")
             
-            time.sleep(3)
+            self.waits.document_ready(self.driver)
             input_selectors = [
                 (By.ID, "dataInicial"),
                 (By.NAME, "dataInicial"),
@@ -144,17 +129,9 @@ class PrefeituraScraper:
                 (By.XPATH, "//input[contains(@type, 'text') and contains(@placeholder, 'data')]")
             ]
             
-            start_date_input = None
-            for selector_type, selector_value in input_selectors:
-                try:
-                    logger.info(f"Tentando seletor: {selector_type}={selector_value}")
-                    start_date_input = WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_element_located((selector_type, selector_value))
-                    )
-                    logger.info(f"Elemento encontrado com seletor: {selector_type}={selector_value}")
-                    break
-                except:
-                    continue
+            start_date_input = self.waits.presence(self.driver, input_selectors)
+            if start_date_input:
+                logger.info(f"Campo de data inicial encontrado: {start_date_input.get_attribute('outerHTML')}")
             
             if not start_date_input:
                 logger.info("Tentando encontrar campo de data usando JavaScript")
@@ -176,18 +153,12 @@ class PrefeituraScraper:
                     
             if not start_date_input:
                 logger.warning("Não foi possível encontrar o campo de data inicial")
-                screenshot_path = os.path.join(self.DOWNLOAD_PATH, "form_screenshot.png")
-                self.driver.save_screenshot(screenshot_path)
-                logger.info(f"Screenshot salvo em: {screenshot_path}")
-                page_source = self.driver.page_source
-                with open(os.path.join(self.DOWNLOAD_PATH, "page_source.html"), "w", encoding="utf-8") as f:
-                    f.write(page_source)
-                logger.info("HTML da página salvo para depuração")
+                self.debug.capture(self.driver, "form", failure=True, html=True)
                 try:
                     search_url = f"{self.BASE_URL}/pesquisa?dataInicial={start_date_str.replace('/', '%2F')}&dataFinal={end_date_str.replace('/', '%2F')}"
                     logger.info(f"Tentando acessar URL de pesquisa diretamente: {search_url}")
-                    self.driver.get(search_url)
-                    time.sleep(5)
+                    self.load_page(search_url)
+                    self.waits.presence(self.driver, [(By.TAG_NAME, "table")], step="results")
                     logger.info("Tentativa de pesquisa direta por URL realizada")
                     return
                 except Exception as e:
@@ -197,7 +168,7 @@ class PrefeituraScraper:
             try:
                 logger.info("Interagindo com o campo de data inicial")
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", start_date_input)
-                time.sleep(1)
+                self.waits.clickable(self.driver, start_date_input)
                 self.driver.execute_script("arguments[0].value = '';", start_date_input)
                 start_date_input.send_keys(start_date_str)
                 logger.info(f"Data inicial preenchida: {start_date_str}")
@@ -232,7 +203,7 @@ class PrefeituraScraper:
                     if search_button:
                         logger.info("Botão de pesquisa encontrado, clicando...")
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", search_button)
-                        time.sleep(1)
+                        self.waits.clickable(self.driver, search_button)
                         search_button.click()
                     else:
                         logger.info("Botão não encontrado, tentando submeter com Enter")
@@ -245,22 +216,18 @@ class PrefeituraScraper:
                         self.driver.execute_script("arguments[0].submit();", form)
                     except Exception as form_e:
                         logger.warning(f"Erro ao enviar formulário: {str(form_e)}")
-                try:
-                    logger.info("Aguardando resultados da pesquisa...")
-                    WebDriverWait(self.driver, 15).until(
-                        EC.any_of(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "table.table")),
-                            EC.presence_of_element_located((By.TAG_NAME, "table")),
-                            EC.presence_of_element_located((By.CSS_SELECTOR, ".table")),
-                            EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'result')]"))
-                        )
-                    )
+                logger.info("Aguardando resultados da pesquisa...")
+                results_found = self.waits.presence(self.driver, [
+                    (By.CSS_SELECTOR, "table.table"),
+                    (By.TAG_NAME, "table"),
+                    (By.CSS_SELECTOR, ".table"),
+                    (By.XPATH, "//div[contains(@class, 'result')]")
+                ], step="results")
+                if results_found:
                     logger.info("Tabela/resultados encontrados")
-                except TimeoutException:
+                else:
                     logger.warning("Não foi possível encontrar a tabela de resultados após a pesquisa")
-                screenshot_path = os.path.join(self.DOWNLOAD_PATH, "search_results.png")
-                self.driver.save_screenshot(screenshot_path)
-                logger.info(f"Screenshot dos resultados salvo em: {screenshot_path}")
+                self.debug.capture(self.driver, "search_results", failure=not results_found)
                 
                 logger.info(f"Filtro de datas configurado: {start_date_str} a {end_date_str}")
             except Exception as input_e:
@@ -271,8 +238,7 @@ class PrefeituraScraper:
 
     def get_publication_links(self):
         def find_table():
-            screenshot_path = os.path.join(self.DOWNLOAD_PATH, "before_table_extraction.png")
-            self.driver.save_screenshot(screenshot_path)
+            self.debug.capture(self.driver, "before_table_extraction")
             
             table_selectors = [
                 (By.CSS_SELECTOR, "table.table"),
@@ -285,17 +251,10 @@ class PrefeituraScraper:
                 (By.XPATH, "//div[@class='table-responsive']//table")
             ]
             
-            for selector_type, selector_value in table_selectors:
-                try:
-                    logger.info(f"Tentando encontrar tabela com seletor: {selector_type}={selector_value}")
-                    table = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((selector_type, selector_value))
-                    )
-                    if table and table.is_displayed():
-                        logger.info(f"Tabela encontrada com seletor: {selector_type}={selector_value}")
-                        return table
-                except Exception:
-                    continue
+            table = self.waits.presence(self.driver, table_selectors, step="results")
+            if table and table.is_displayed():
+                logger.info("Tabela de resultados encontrada")
+                return table
             logger.warning("Tabela não encontrada, procurando estruturas alternativas")
             alternative_selectors = [
                 (By.CSS_SELECTOR, "div.results"),
@@ -315,79 +274,44 @@ class PrefeituraScraper:
                     continue
             
             logger.error("Não foi possível encontrar a tabela de resultados ou estruturas alternativas")
-            with open(os.path.join(self.DOWNLOAD_PATH, "results_page.html"), "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
-            logger.info("HTML da página de resultados salvo para depuração")
+            self.debug.capture(self.driver, "results_page", failure=True, html=True)
             return None
 
-        def parse_date(date_str):
-            try:
-                return datetime.strptime(date_str, "%d/%m/%Y")
-            except ValueError:
-                date_formats = ["%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d.%m.%Y"]
-                for date_format in date_formats:
-                    try:
-                        return datetime.strptime(date_str, date_format)
-                    except ValueError:
-                        continue
-                logger.error(f"Não foi possível converter a data: {date_str}, usando data atual")
-                return datetime.now()
-
-        def extract_link(row, cells, row_index):
-            try:
-                link_element = cells[2].find_element(By.TAG_NAME, "a")
-                link = link_element.get_attribute("href")
-                logger.info(f"Link encontrado: {link}")
-                return link
-            except NoSuchElementException:
-                logger.warning(f"Não foi encontrado link na linha {row_index}, tentando alternativas")
-                try:
-                    link_element = row.find_element(By.TAG_NAME, "a")
-                    link = link_element.get_attribute("href")
-                    logger.info(f"Link alternativo encontrado: {link}")
-                    return link
-                except NoSuchElementException:
-                    logger.error(f"Nenhum link encontrado na linha {row_index}, pulando")
-                    return None
-
-        publications = []
         try:
             table = find_table()
             if not table:
                 return []
-            rows = table.find_elements(By.TAG_NAME, "tr")
-            logger.info(f"Encontradas {len(rows)} linhas na tabela")
-            if len(rows) <= 1:
-                logger.warning("Tabela encontrada, mas sem dados (apenas cabeçalho)")
-                return []
-            for row_index, row in enumerate(rows[1:], 1):
-                try:
-                    logger.info(f"Processando linha {row_index} da tabela")
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    if len(cells) < 3:
-                        logger.warning(f"Linha {row_index} tem menos de 3 colunas, pulando")
-                        continue
-                    date_str = cells[0].text.strip()
-                    title = cells[1].text.strip()
-                    logger.info(f"Data: {date_str}, Título: {title}")
-                    link = extract_link(row, cells, row_index)
-                    if not link:
-                        continue
-                    publication_date = parse_date(date_str)
-                    publications.append({
-                        "date": publication_date,
-                        "competence": publication_date.strftime("%Y-%m"),
-                        "title": title,
-                        "link": link
-                    })
-                    logger.info(f"Publicação adicionada: {title} ({publication_date.strftime('%Y-%m-%d')})")
-                except Exception as e:
-                    logger.warning(f"Erro ao processar linha {row_index} da tabela: {str(e)}")
-                    continue
-            logger.info(f"Extraídos {len(publications)} links de publicações")
+            # Uma única leitura do DOM, analisada localmente, em vez de uma chamada
+            # ao WebDriver para cada linha, célula e link da tabela
+            html, url = self.driver.page_source, self.driver.current_url
+            with PARSE_SECONDS.time(engine="selenium"):
+                return parse_listing(html, url)
         except Exception as e:
             logger.error(f"Erro ao extrair links de publicações: {str(e)}")
-        return publications
+            return []
+
+    def paginate_directly(self):
+        """Lê as demais páginas pelas URLs da paginação, em paralelo e fora do
+        navegador (com os cookies da sessão do Chrome). Devolve ``None`` quando
+        não há paginação numerada ou a leitura direta falha, para que a
+        navegação pelo botão 'próximo' seja usada."""
+        page_urls = find_page_urls(self.driver.page_source, self.driver.current_url)
+        if not page_urls:
+            return None
+
+        logger.info(f"Paginação direta: {len(page_urls) + 1} páginas encontradas")
+        session = create_session(pool_size=max(1, self.pagination_workers))
+        try:
+            session.headers["User-Agent"] = self.driver.execute_script("return navigator.userAgent")
+            for cookie in self.driver.get_cookies():
+                session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"))
+            return self.fetch_listing_pages(
+                page_urls, lambda url: self.fetch_listing_page(session, url, "selenium"), "selenium")
+        except Exception as e:
+            logger.warning(f"Paginação direta falhou, usando o botão 'próximo': {str(e)}")
+            return None
+        finally:
+            session.close()
 
     def navigate_pagination(self):
         all_publications = []
@@ -395,17 +319,15 @@ class PrefeituraScraper:
         
         while True:
             logger.info(f"Processando página {page}")
-            screenshot_path = os.path.join(self.DOWNLOAD_PATH, f"page_{page}.png")
-            self.driver.save_screenshot(screenshot_path)
+            self.debug.capture(self.driver, f"page_{page}")
             publications = self.get_publication_links()
             
             if not publications:
                 logger.warning(f"Nenhuma publicação encontrada na página {page}")
-                if page == 1:
+                if page == 1 and not self.high_water_mark and not self.date_range:
                     logger.info("Tentando abordagem alternativa para encontrar publicações")
                     try:
-                        with open(os.path.join(self.DOWNLOAD_PATH, "page_source_pagination.html"), "w", encoding="utf-8") as f:
-                            f.write(self.driver.page_source)
+                        self.debug.capture(self.driver, "pagination", failure=True, html=True)
                         logger.info("Criando publicação de teste para continuar o fluxo")
                         test_publication = {
                             "date": datetime.now() - timedelta(days=30),
@@ -419,8 +341,19 @@ class PrefeituraScraper:
 
                 break
             
+            publications, reached_known = self.filter_new_publications(publications)
             all_publications.extend(publications)
             logger.info(f"Total de publicações até agora: {len(all_publications)}")
+            if reached_known:
+                break
+
+            if page == 1:
+                direct = self.paginate_directly()
+                if direct is not None:
+                    publications, pages = direct
+                    all_publications.extend(publications)
+                    page += pages
+                    break
             
             try:
                 pagination_selectors = [
@@ -457,27 +390,18 @@ class PrefeituraScraper:
                     break
 
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-                time.sleep(1)
+                self.waits.clickable(self.driver, next_button)
 
                 logger.info("Clicando no botão 'próximo'...")
                 next_button.click()
+                self.pages_loaded += 1
 
-                time.sleep(3)  
-                
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.staleness_of(next_button)
-                    )
-                except:
+                if self.waits.staleness(self.driver, next_button) is None:
                     logger.warning("Não foi possível confirmar o carregamento da próxima página")
                 
                 page += 1
                 logger.info(f"Avançou para a página {page}")
-
-                if page > 10:
-                    logger.warning("Limite de 10 páginas atingido, interrompendo navegação")
-                    break
-                time.sleep(2)
+                self.waits.document_ready(self.driver)
             except Exception as e:
                 logger.error(f"Erro ao navegar para a próxima página: {str(e)}")
                 break
@@ -490,8 +414,8 @@ class PrefeituraScraper:
             date_str = publication["date"].strftime("%Y-%m-%d")
             sanitized_title = re.sub(r'[^\w\s-]', '', publication["title"])
             sanitized_title = re.sub(r'[\s]+', '_', sanitized_title)
-            filename = f"{date_str}_{sanitized_title[:50]}.pdf"
-            file_path = self.DOWNLOAD_PATH / filename
+            file_path = self.build_file_path(publication)
+            filename = file_path.name
             
             logger.info(f"Preparando para baixar: {filename}")
 
@@ -499,14 +423,13 @@ class PrefeituraScraper:
                 logger.info(f"Arquivo já existe: {filename}")
                 return str(file_path)
 
+            existing_downloads = set(self.download_dir.glob("*.pdf"))
             logger.info(f"Navegando para: {publication['link']}")
-            self.driver.get(publication["link"])
+            self.load_page(publication["link"])
 
-            screenshot_path = os.path.join(self.DOWNLOAD_PATH, f"download_{sanitized_title[:20]}.png")
-            self.driver.save_screenshot(screenshot_path)
+            self.debug.capture(self.driver, f"download_{sanitized_title[:20]}")
 
-            logger.info("Aguardando download...")
-            time.sleep(5)
+            self.waits.document_ready(self.driver)
 
             current_url = self.driver.current_url
             logger.info(f"URL atual após navegação: {current_url}")
@@ -516,12 +439,11 @@ class PrefeituraScraper:
                 import requests
                 
                 try:
-                    response = requests.get(current_url, timeout=30)
-                    if response.status_code == 200:
-                        with open(file_path, 'wb') as f:
-                            f.write(response.content)
-                        logger.info(f"PDF baixado manualmente: {filename}")
-                        return str(file_path)
+                    with requests.get(current_url, timeout=30, stream=True) as response:
+                        if response.status_code == 200:
+                            publication["checksum"], _ = stream_to_file(response, file_path)
+                            logger.info(f"PDF baixado manualmente: {filename}")
+                            return str(file_path)
                 except Exception as req_err:
                     logger.error(f"Erro ao baixar PDF manualmente: {str(req_err)}")
 
@@ -532,20 +454,18 @@ class PrefeituraScraper:
                     pdf_url = pdf_links[0].get_attribute("href")
 
                     import requests
-                    response = requests.get(pdf_url, timeout=30)
-                    if response.status_code == 200:
-                        with open(file_path, 'wb') as f:
-                            f.write(response.content)
-                        logger.info(f"PDF baixado via link direto: {filename}")
-                        return str(file_path)
+                    with requests.get(pdf_url, timeout=30, stream=True) as response:
+                        if response.status_code == 200:
+                            publication["checksum"], _ = stream_to_file(response, file_path)
+                            logger.info(f"PDF baixado via link direto: {filename}")
+                            return str(file_path)
             except Exception as e:
                 logger.error(f"Erro ao baixar via link direto: {str(e)}")
             
-            downloads = list(self.DOWNLOAD_PATH.glob("*.pdf"))
+            logger.info("Aguardando download...")
+            latest_download = self.waits.download_complete(self.download_dir, existing_downloads)
             
-            if downloads:
-                latest_download = max(downloads, key=os.path.getctime)
-
+            if latest_download:
                 new_path = self.DOWNLOAD_PATH / filename
                 latest_download.rename(new_path)
                 
@@ -553,6 +473,7 @@ class PrefeituraScraper:
                 return str(new_path)
 
             logger.warning(f"Não foi possível confirmar o download: {publication['title']}")
+            self.debug.capture(self.driver, f"download_failed_{sanitized_title[:20]}", failure=True, html=True)
             logger.info("Criando arquivo PDF vazio para testes")
             
             try:
@@ -584,24 +505,49 @@ class PrefeituraScraper:
             logger.error(f"Erro ao baixar publicação: {str(e)}")
             return None
 
-    def run(self):
-        try:
-            logger.info("Iniciando processo de scraping")
+    def discover(self):
+        """Lista as publicações do período sem baixá-las. O driver continua aberto
+        para os downloads; quem chama é responsável por ``close``."""
+        if not self.driver:
             self.init_driver()
-            self.navigate_to_site()
+        self.navigate_to_site()
 
-            first_day, last_day = self.get_last_month_date_range()
-            logger.info(f"Período de busca: {first_day.strftime('%d/%m/%Y')} a {last_day.strftime('%d/%m/%Y')}")
+        first_day, last_day = self.get_search_date_range()
+        logger.info(f"Período de busca: {first_day.strftime('%d/%m/%Y')} a {last_day.strftime('%d/%m/%Y')}")
 
-            try:
-                self.set_date_filter(first_day, last_day)
-                logger.info("Filtro de datas configurado com sucesso")
-            except Exception as e:
-                logger.warning(f"Não foi possível configurar filtro de datas: {str(e)}")
-                logger.info("Continuando com a busca sem filtro de datas específico")
+        try:
+            self.set_date_filter(first_day, last_day)
+            logger.info("Filtro de datas configurado com sucesso")
+        except Exception as e:
+            logger.warning(f"Não foi possível configurar filtro de datas: {str(e)}")
+            logger.info("Continuando com a busca sem filtro de datas específico")
+
+        return self.navigate_pagination()
+
+    def close(self):
+        self.waits.report()
+        if self.browser:
+            self.browser_pool.release(self.browser, pages=self.pages_loaded)
+            self.browser = None
+            self.driver = None
+            self.download_dir = self.DOWNLOAD_PATH
+            logger.info("Driver do Selenium devolvido ao pool")
+        elif self.driver:
+            self.driver.quit()
+            self.driver = None
+            logger.info("Driver do Selenium encerrado")
+        self.pages_loaded = 0
 
-            publications = self.navigate_pagination()
+    def run(self):
+        try:
+            logger.info("Iniciando processo de scraping")
+            publications = self.discover()
+            self.discovered = publications
             
+            if not publications and self.high_water_mark:
+                logger.info("Nenhuma publicação nova desde a última execução")
+                return []
+
             if not publications:
                 logger.warning("Nenhuma publicação encontrada")
                 test_publication = {
@@ -612,20 +558,8 @@ class PrefeituraScraper:
                 }
                 publications = [test_publication]
 
-            if len(publications) > 5:
-                logger.info(f"Limitando a 5 publicações para download (de {len(publications)} encontradas)")
-                publications = publications[:5]
-
-            result = []
-            for i, pub in enumerate(publications):
-                logger.info(f"Baixando publicação {i+1}/{len(publications)}: {pub['title']}")
-                file_path = self.download_publication(pub)
-                
-                if file_path:
-                    pub["file_path"] = file_path
-                    result.append(pub)
-
-                time.sleep(1)
+            publications = self.limit_publications(publications)
+            result = self.download_publications(publications)
             
             logger.info(f"Processo de scraping concluído. {len(result)} arquivos baixados.")
             return result
@@ -635,6 +569,4 @@ class PrefeituraScraper:
             logger.error(traceback.format_exc())
             return []
         finally:
-            if self.driver:
-                self.driver.quit()
-                logger.info("Driver do Selenium encerrado")
\ No newline at end of file
+            self.close()
\ No newline at end of file
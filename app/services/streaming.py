@@ -0,0 +1,98 @@
+import os
+import io
+import uuid
+import hashlib
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+
+# mkstemp cria o arquivo com 0600; o arquivo final recebe o modo de um open() comum.
+# A umask é lida uma única vez: os.umask altera o processo inteiro e não é segura entre threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def stream_to_file(response, file_path, chunk_size=CHUNK_SIZE):
+    """Grava o corpo de uma resposta ``stream=True`` em blocos num arquivo
+    temporário, calculando o SHA-256 no caminho, e só então o renomeia de forma
+    atômica para ``file_path``. Retorna ``(sha256, tamanho_em_bytes)``."""
+    file_path = str(file_path)
+    directory = os.path.dirname(os.path.abspath(file_path))
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return digest.hexdigest(), size
+
+
+def file_sha256(file_path, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MultipartFileStream:
+    """Corpo ``multipart/form-data`` com um único arquivo, lido do disco sob
+    demanda. Como expõe ``read`` e ``__len__``, o ``requests`` envia o arquivo em
+    blocos com ``Content-Length`` definido em vez de montar o corpo em memória."""
+
+    def __init__(self, field_name, file_path, file_name=None, content_type="application/octet-stream"):
+        self.boundary = uuid.uuid4().hex
+        file_name = (file_name or os.path.basename(str(file_path))).replace('"', "%22")
+        head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{file_name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+        self._file = open(file_path, "rb")
+        self._parts = [io.BytesIO(head), self._file, io.BytesIO(tail)]
+        self._length = len(head) + os.path.getsize(file_path) + len(tail)
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            return b"".join(part.read() for part in self._parts)
+
+        data = b""
+        while self._parts and len(data) < size:
+            chunk = self._parts[0].read(size - len(data))
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            data += chunk
+        return data
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
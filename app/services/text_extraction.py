@@ -0,0 +1,82 @@
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # extração de texto é opcional
+    PdfReader = None
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+MAX_CHARS = int(os.getenv("TEXT_EXTRACTION_MAX_CHARS", "1000000"))
+
+def extract_text(file_path, max_chars=MAX_CHARS):
+    """Extrai o texto de um PDF. Roda nos processos do pool, por isso é uma
+    função de módulo. Devolve ``""`` para PDFs sem camada de texto (digitalizados)
+    e ``None`` quando o arquivo não pôde ser lido."""
+    try:
+        reader = PdfReader(file_path)
+        parts = []
+        size = 0
+        for page in reader.pages:
+            page_text = page.extract_text() or ""
+            parts.append(page_text)
+            size += len(page_text)
+            if size >= max_chars:
+                break
+        # PostgreSQL não aceita NUL em colunas de texto
+        content = " ".join(" ".join(parts).replace("\x00", " ").split())
+        return content[:max_chars]
+    except Exception as e:
+        logger.warning(f"Não foi possível extrair texto de {file_path}: {str(e)}")
+        return None
+
+class TextExtractor:
+    """Extrai o texto dos PDFs baixados em um pool de processos e grava no
+    índice de busca textual (``publication_texts``)."""
+
+    def __init__(self, workers=None, batch_size=None):
+        self.workers = workers or int(os.getenv("TEXT_EXTRACTION_WORKERS", str(os.cpu_count() or 2)))
+        self.batch_size = batch_size or int(os.getenv("TEXT_EXTRACTION_BATCH_SIZE", "50"))
+
+    @property
+    def available(self):
+        return PdfReader is not None
+
+    def index_pending(self, db_manager):
+        """Indexa todas as publicações com arquivo local ainda sem texto extraído.
+        Devolve a quantidade de textos gravados."""
+        if not self.available:
+            logger.warning("⚠️ pypdf não instalado; indexação de texto desativada")
+            return 0
+
+        indexed = 0
+        skipped = 0
+        after_id = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                pending = db_manager.get_publications_to_index(after_id=after_id, limit=self.batch_size)
+                if not pending:
+                    break
+                after_id = pending[-1]["id"]
+
+                available = [pub for pub in pending if os.path.exists(pub["file_path"])]
+                skipped += len(pending) - len(available)
+                paths = [pub["file_path"] for pub in available]
+                chunksize = max(1, len(paths) // (self.workers * 4))
+                texts = [
+                    {"publication_id": pub["id"], "content": content}
+                    for pub, content in zip(available, executor.map(extract_text, paths, chunksize=chunksize))
+                    if content is not None
+                ]
+                indexed += db_manager.save_publication_texts(texts)
+
+        if skipped:
+            logger.info(f"{skipped} publicações sem arquivo local não foram indexadas")
+        logger.info(f"🔎 {indexed} publicações indexadas para busca textual")
+        return indexed
@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from core.database import UploadedFile, get_engine, init_db
+
+logger = logging.getLogger(__name__)
+
+class UploadIndex:
+    """Índice endereçado por conteúdo: mapeia o SHA-256 de cada arquivo para a
+    URL pública já obtida no upload. Fica no banco (tabela ``uploaded_files``),
+    compartilhado entre execuções, workers e containers. Sem banco o índice é
+    ignorado e os arquivos são simplesmente reenviados."""
+
+    def __init__(self, db_url=None):
+        self.db_url = db_url
+        self.available = True
+        self._engine = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            engine = get_engine(self.db_url)
+            init_db(engine)
+            self._engine = engine
+        return self._engine
+
+    def _insert(self):
+        if self.engine.dialect.name == "sqlite":
+            return sqlite.insert(UploadedFile.__table__)
+        return postgresql.insert(UploadedFile.__table__)
+
+    def _disable(self, error):
+        # Um único aviso por execução, em vez de um por arquivo
+        if self.available:
+            logger.warning(f"Índice de uploads indisponível, arquivos serão reenviados: {str(error)}")
+        self.available = False
+
+    def get(self, digest):
+        if not self.available:
+            return None
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(select(UploadedFile.url).where(UploadedFile.checksum == digest)).scalar()
+        except Exception as e:
+            self._disable(e)
+            return None
+
+    def put(self, digest, url, file_name=None, size=None):
+        if not self.available:
+            return
+        # Dois workers enviando o mesmo conteúdo: vale a primeira URL registrada
+        stmt = self._insert().values(
+            checksum=digest, url=url, file_name=file_name, size=size, uploaded_at=datetime.utcnow(),
+        ).on_conflict_do_nothing(index_elements=["checksum"])
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(stmt)
+        except Exception as e:
+            self._disable(e)
+
+    def __len__(self):
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(UploadedFile)).scalar()
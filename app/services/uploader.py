@@ -1,28 +1,138 @@
 import os
+import time
+import random
 import logging
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from requests.exceptions import RequestException
 
+from .downloader import create_session
+from .streaming import MultipartFileStream, file_sha256
+from .upload_index import UploadIndex
+
+from core.metrics import UPLOAD_SECONDS
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
+class CircuitOpenError(Exception):
+    """O circuito está aberto e o envio não foi tentado."""
+
+class CircuitBreaker:
+    """Após ``failure_threshold`` falhas seguidas o circuito abre e as chamadas
+    falham imediatamente por ``reset_timeout`` segundos; depois disso uma única
+    tentativa de teste decide se ele volta a fechar."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._half_open_probe = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            if self._half_open_probe:
+                return False
+            self._half_open_probe = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._half_open_probe = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._half_open_probe or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._half_open_probe:
+                    logger.warning(f"⚡ Circuito do 0x0.st aberto após {self.failures} falhas consecutivas")
+                self.opened_at = time.monotonic()
+                self._half_open_probe = False
+
 class FileUploader0x0st:
+    USER_AGENTS = [
+        'curl/7.68.0', 
+        'Mozilla/5.0 (X11; Linux x86_64; rv:90.0) Gecko/20100101 Firefox/90.0',
+        'wget/1.20.3 (linux-gnu)',
+        'HTTPie/2.4.0'
+    ]
     
-    def __init__(self):
+    def __init__(self, workers=None, max_attempts=None, timeout=None, index=None):
         self.upload_url = "https://0x0.st"
         self.uploaded_urls = []  
+        self.index = index if index is not None else UploadIndex()
+        self.workers = workers or int(os.getenv("UPLOAD_WORKERS", "4"))
+        self.max_attempts = max_attempts or int(os.getenv("UPLOAD_MAX_ATTEMPTS", str(len(self.USER_AGENTS))))
+        self.connect_timeout = float(os.getenv("UPLOAD_CONNECT_TIMEOUT", "5"))
+        self.timeout = timeout or float(os.getenv("UPLOAD_TIMEOUT", "30"))
+        self.backoff_base = float(os.getenv("UPLOAD_BACKOFF_BASE", "1"))
+        self.backoff_max = float(os.getenv("UPLOAD_BACKOFF_MAX", "30"))
+        # Sem retries no adapter: o laço de post_file e o circuit breaker são a única política de tentativas
+        self.session = create_session(pool_size=self.workers, retry=False)
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv("UPLOAD_CIRCUIT_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("UPLOAD_CIRCUIT_RESET", "60")),
+        )
+        self._lock = threading.Lock()
+
+    def backoff_delay(self, attempt):
+        # Backoff exponencial com "full jitter"
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def post_file(self, file_path, file_name):
+        for attempt in range(self.max_attempts):
+            if not self.circuit_breaker.allow():
+                raise CircuitOpenError(f"circuito aberto, upload de {file_name} não foi tentado")
+
+            user_agent = self.USER_AGENTS[attempt % len(self.USER_AGENTS)]
+            try:
+                with MultipartFileStream('file', file_path, file_name, 'application/pdf') as body:
+                    headers = {'User-Agent': user_agent, 'Content-Type': body.content_type}
+                    response = self.session.post(
+                        self.upload_url, 
+                        data=body, 
+                        headers=headers,
+                        timeout=(self.connect_timeout, self.timeout)
+                    )
+                if response.status_code == 200:
+                    self.circuit_breaker.record_success()
+                    return response.text.strip()
+                logger.debug(f"Tentativa {attempt + 1} com {user_agent} retornou HTTP {response.status_code}")
+            except RequestException as e:
+                logger.debug(f"Tentativa {attempt + 1} com {user_agent} falhou: {e}")
+
+            self.circuit_breaker.record_failure()
+            if attempt + 1 < self.max_attempts:
+                time.sleep(self.backoff_delay(attempt))
+        return None
     
-    def upload_file(self, file_path):
+    def upload_file(self, file_path, checksum=None, allow_simulated=True):
         if not os.path.exists(file_path):
             logger.error(f"Arquivo não encontrado: {file_path}")
             return None
         
         file_name = Path(file_path).name
         file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
+        digest = checksum or file_sha256(file_path)
+
+        cached_url = self.index.get(digest)
+        if cached_url:
+            with self._lock:
+                self.uploaded_urls.append(cached_url)
+            logger.info(f"♻️ Conteúdo já enviado anteriormente, reutilizando URL: {file_name} -> {cached_url}")
+            return cached_url
         
         logger.info(f"📤 Fazendo upload para 0x0.st: {file_name} ({file_size:.2f} MB)")
 
@@ -30,45 +140,35 @@ class FileUploader0x0st:
         print(f"📄 Arquivo: {file_name}")
         
         try:
-            user_agents = [
-                'curl/7.68.0', 
-                'Mozilla/5.0 (X11; Linux x86_64; rv:90.0) Gecko/20100101 Firefox/90.0',
-                'wget/1.20.3 (linux-gnu)',
-                'HTTPie/2.4.0'
-            ]
-            
-            for user_agent in user_agents:
-                try:
-                    headers = {'User-Agent': user_agent}
-                    with open(file_path, 'rb') as file:
-                        files = {'file': (file_name, file, 'application/pdf')}
-                        response = requests.post(
-                            self.upload_url, 
-                            files=files, 
-                            headers=headers,
-                            timeout=30
-                        )
-                        if response.status_code == 200:
-                            public_url = response.text.strip()
-                            self.uploaded_urls.append(public_url)
-                            
-                            print("✅ Upload realizado com sucesso para 0x0.st!")
-                            print(f"🔗 URL pública: {public_url}")
-                            print("-" * 50)
-                            
-                            logger.info(f"✅ Upload bem-sucedido para 0x0.st: {public_url}")
-                            return public_url
-                        
-                except Exception as e:
-                    logger.debug(f"Tentativa com {user_agent} falhou: {e}")
-                    continue
+            with UPLOAD_SECONDS.time(result="failed") as labels:
+                public_url = self.post_file(file_path, file_name)
+                if public_url:
+                    labels["result"] = "uploaded"
+            if public_url:
+                with self._lock:
+                    self.uploaded_urls.append(public_url)
+                self.index.put(digest, public_url, file_name=file_name, size=os.path.getsize(file_path))
+                
+                print("✅ Upload realizado com sucesso para 0x0.st!")
+                print(f"🔗 URL pública: {public_url}")
+                print("-" * 50)
+                
+                logger.info(f"✅ Upload bem-sucedido para 0x0.st: {public_url}")
+                return public_url
+
+            if not allow_simulated:
+                logger.warning(f"❌ Upload de {file_name} falhou, ficará para uma nova tentativa")
+                return None
 
             print("❌ 0x0.st não está acessível no momento")
             print("📄 DEMONSTRAÇÃO: URL que seria retornada pelo 0x0.st:")
 
-            simulated_url = f"https://0x0.st/{hash(file_name) % 100000:05d}"
+            # Derivada do conteúdo para ser estável entre execuções (hash() é aleatorizado por processo).
+            # URLs simuladas não entram no índice, para que o envio real seja tentado novamente.
+            simulated_url = f"https://0x0.st/{int(digest[:16], 16) % 100000:05d}"
 
-            self.uploaded_urls.append(simulated_url)
+            with self._lock:
+                self.uploaded_urls.append(simulated_url)
 
             print("✅ DEMONSTRAÇÃO: Upload simulado para 0x0.st")
             print(f"📄 Arquivo: {file_name}")
@@ -79,6 +179,10 @@ class FileUploader0x0st:
             logger.info(f"✅ Upload simulado para 0x0.st: {simulated_url}")
             return simulated_url
                     
+        except CircuitOpenError as e:
+            # Indisponibilidade não vira URL simulada: o arquivo fica para uma próxima tentativa
+            logger.warning(f"⚡ {str(e)}")
+            return None
         except Exception as e:
             logger.error(f"❌ Erro inesperado: {str(e)}")
             print(f"❌ Erro inesperado ao fazer upload de: {file_name}")
@@ -86,17 +190,28 @@ class FileUploader0x0st:
             print("-" * 50)
             return None
     
-    def upload_multiple_files(self, file_paths):
+    def upload_multiple_files(self, file_paths, checksums=None, allow_simulated=True):
+        """Envia os arquivos em paralelo e devolve ``{caminho: url}`` apenas com
+        os envios bem-sucedidos, para que o chamador associe cada URL ao seu
+        arquivo independentemente da ordem de conclusão. Com ``allow_simulated=False``
+        envios que falharam ficam de fora em vez de receberem uma URL simulada."""
         print("🚀 INICIANDO UPLOADS PARA 0x0.st")
         print("=" * 50)
         
-        successful_uploads = []
+        checksums = checksums or {}
+        successful_uploads = {}
         failed_uploads = []
         
-        for file_path in file_paths:
-            url = self.upload_file(file_path)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="upload") as executor:
+            futures = {
+                str(file_path): executor.submit(self.upload_file, file_path, checksums.get(str(file_path)), allow_simulated)
+                for file_path in file_paths
+            }
+
+        for file_path, future in futures.items():
+            url = future.result()
             if url:
-                successful_uploads.append(url)
+                successful_uploads[file_path] = url
             else:
                 failed_uploads.append(file_path)
                 
@@ -107,8 +222,8 @@ class FileUploader0x0st:
         
         if successful_uploads:
             print("\n🔗 URLs PÚBLICAS ARMAZENADAS:")
-            for i, url in enumerate(successful_uploads, 1):
-                print(f"{i}. {url}")
+            for i, (file_path, url) in enumerate(successful_uploads.items(), 1):
+                print(f"{i}. {Path(file_path).name} -> {url}")
         
         if failed_uploads:
             print("\n💥 ARQUIVOS QUE FALHARAM:")
@@ -122,6 +237,9 @@ class FileUploader0x0st:
     def get_uploaded_urls(self):
         return self.uploaded_urls.copy()
 
+    def close(self):
+        self.session.close()
+
 def main():
     uploader = FileUploader0x0st()
 
@@ -0,0 +1,136 @@
+import os
+import time
+import logging
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+class ScraperWaits:
+    """Esperas orientadas a condição para o scraper, no lugar de ``time.sleep``.
+
+    Cada etapa tem um timeout próprio (sobrescrevível pelo construtor ou pela
+    variável ``SCRAPER_WAIT_<ETAPA>``, em segundos) e o tempo efetivamente gasto
+    esperando é acumulado por etapa para o relatório ao fim da execução."""
+
+    DEFAULT_TIMEOUTS = {
+        "page_load": 15,
+        "element": 5,
+        "results": 15,
+        "clickable": 5,
+        "staleness": 10,
+        "network_idle": 10,
+        "download": 15,
+    }
+    POLL_INTERVAL = 0.2
+    NETWORK_IDLE_TIME = 0.5
+
+    def __init__(self, timeouts=None):
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS)
+        for step in self.timeouts:
+            env_value = os.getenv(f"SCRAPER_WAIT_{step.upper()}")
+            if env_value:
+                self.timeouts[step] = float(env_value)
+        self.timeouts.update(timeouts or {})
+        self.stats = {}
+
+    def timeout_for(self, step, timeout=None):
+        if timeout is not None:
+            return timeout
+        return self.timeouts.get(step, self.timeouts["element"])
+
+    @contextmanager
+    def measure(self, step):
+        entry = self.stats.setdefault(step, {"count": 0, "seconds": 0.0, "timeouts": 0})
+        start = time.monotonic()
+        try:
+            yield entry
+        finally:
+            entry["count"] += 1
+            entry["seconds"] += time.monotonic() - start
+
+    def until(self, driver, condition, step="element", timeout=None):
+        """Aguarda ``condition`` e devolve seu resultado, ou ``None`` se o timeout
+        da etapa estourar."""
+        with self.measure(step) as entry:
+            try:
+                return WebDriverWait(driver, self.timeout_for(step, timeout), poll_frequency=self.POLL_INTERVAL).until(condition)
+            except TimeoutException:
+                entry["timeouts"] += 1
+                logger.warning(f"Timeout na espera '{step}' após {self.timeout_for(step, timeout)}s")
+                return None
+
+    def document_ready(self, driver, step="page_load", timeout=None):
+        return self.until(
+            driver,
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            step=step,
+            timeout=timeout,
+        )
+
+    def presence(self, driver, locators, step="element", timeout=None):
+        conditions = [EC.presence_of_element_located(locator) for locator in locators]
+        return self.until(driver, EC.any_of(*conditions), step=step, timeout=timeout)
+
+    def clickable(self, driver, element, step="clickable", timeout=None):
+        return self.until(driver, EC.element_to_be_clickable(element), step=step, timeout=timeout)
+
+    def staleness(self, driver, element, step="staleness", timeout=None):
+        return self.until(driver, EC.staleness_of(element), step=step, timeout=timeout)
+
+    def network_idle(self, driver, step="network_idle", timeout=None, idle_time=None):
+        """Considera a página ociosa quando o documento está completo e o número
+        de recursos carregados (Resource Timing) não muda por ``idle_time``."""
+        idle_time = idle_time if idle_time is not None else self.NETWORK_IDLE_TIME
+        state = {"count": -1, "since": time.monotonic()}
+
+        def is_idle(d):
+            ready, count = d.execute_script(
+                "return [document.readyState, performance.getEntriesByType('resource').length];"
+            )
+            now = time.monotonic()
+            if ready != "complete" or count != state["count"]:
+                state["count"] = count
+                state["since"] = now
+                return False
+            return now - state["since"] >= idle_time
+
+        return self.until(driver, is_idle, step=step, timeout=timeout)
+
+    def download_complete(self, directory, existing, step="download", timeout=None, pattern="*.pdf"):
+        """Observa ``directory`` até surgir um arquivo novo (fora de ``existing``)
+        sem download parcial do Chrome (``.crdownload``) em andamento."""
+        timeout = self.timeout_for(step, timeout)
+        with self.measure(step) as entry:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                try:
+                    in_progress = any(directory.glob("*.crdownload"))
+                    new_files = [path for path in directory.glob(pattern) if path not in existing]
+                except OSError:
+                    in_progress, new_files = True, []
+                if new_files and not in_progress:
+                    return max(new_files, key=os.path.getmtime)
+                time.sleep(self.POLL_INTERVAL)
+            entry["timeouts"] += 1
+            logger.warning(f"Timeout na espera '{step}' após {timeout}s")
+            return None
+
+    def report(self):
+        if not self.stats:
+            return {}
+        total = sum(entry["seconds"] for entry in self.stats.values())
+        logger.info(f"⏱️ Tempo total em esperas: {total:.2f}s")
+        for step, entry in sorted(self.stats.items(), key=lambda item: -item[1]["seconds"]):
+            logger.info(
+                f"   {step}: {entry['seconds']:.2f}s em {entry['count']} esperas "
+                f"({entry['timeouts']} timeouts)"
+            )
+        return {step: dict(entry) for step, entry in self.stats.items()}
@@ -0,0 +1,128 @@
+import os
+import time
+import logging
+import multiprocessing
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+from core import JobQueue
+from services import BrowserPool
+from core.shard_leases import ShardLeaseQueue, SHARD_FAILED
+from pipeline import StagedPipeline
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ["day", "week", "month"]
+
+def split_period(start_date, end_date, granularity="week"):
+    """Divide ``[start_date, end_date]`` em shards contíguos de um dia, uma
+    semana (segunda a domingo) ou um mês de calendário."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidade inválida: {granularity}. Use {', '.join(GRANULARITIES)}")
+
+    start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    end = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    shards = []
+    while start <= end:
+        if granularity == "day":
+            shard_end = start
+        elif granularity == "week":
+            shard_end = start + timedelta(days=6 - start.weekday())
+        else:
+            next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+            shard_end = next_month - timedelta(days=1)
+        shard_end = min(shard_end, end)
+        shards.append((start, shard_end))
+        start = shard_end + timedelta(days=1)
+    return shards
+
+def run_shard_worker(engine="http", headless=True, max_publications=None, db_url=None):
+    """Pega shards livres na tabela de leases até a fila esvaziar. Cada shard é
+    listado no período do filtro de datas do site e suas publicações entram na
+    fila do pipeline em etapas, que deduplica por link."""
+    leases = ShardLeaseQueue(db_url)
+    queue = JobQueue(db_url)
+    # Um navegador quente por worker, reaproveitado entre shards (iniciado só se necessário)
+    browser_pool = BrowserPool(size=1, headless=headless)
+    processed = 0
+    discovered = 0
+
+    try:
+        while True:
+            shard = leases.lease_next()
+            if shard is None:
+                break
+            period = f"{shard['start_date']:%d/%m/%Y} a {shard['end_date']:%d/%m/%Y}"
+            logger.info(f"🧩 [{leases.owner}] Processando shard {shard['id']}: {period}")
+            # O filtro do site é inclusivo por dia; o fim do shard cobre o dia inteiro
+            date_range = (shard["start_date"], shard["end_date"].replace(hour=23, minute=59, second=59))
+            try:
+                pipeline = StagedPipeline(
+                    headless=headless,
+                    engine=engine,
+                    max_publications=max_publications,
+                    date_range=date_range,
+                    queue=queue,
+                    browser_pool=browser_pool,
+                )
+                with leases.heartbeat(shard["id"]):
+                    count = pipeline.discover()
+                discovered += count
+                if not leases.renew(shard["id"]):
+                    # Outro worker assumiu o shard; a fila deduplica o que já foi enfileirado
+                    continue
+                leases.complete(shard["id"], count)
+                processed += 1
+            except Exception as e:
+                logger.error(f"❌ Falha no shard {shard['id']} ({period}): {str(e)}")
+                leases.fail(shard["id"], e)
+    finally:
+        browser_pool.close()
+
+    logger.info(f"🧩 [{leases.owner}] Worker finalizado: {processed} shards, {discovered} publicações novas")
+    return processed, discovered
+
+def run_sharded(start_date, end_date, granularity="week", workers=None, engine="http", headless=True,
+                max_publications=None, download_workers=None, db_url=None):
+    """Coordenador: registra os shards do período, dispara ``workers`` processos
+    de listagem e, ao final, processa download/upload/banco dos itens da fila.
+    Devolve um resumo com contagens e tempos de cada fase."""
+    start = time.monotonic()
+    workers = workers or int(os.getenv("SHARD_WORKERS", "4"))
+    shards = split_period(start_date, end_date, granularity)
+    leases = ShardLeaseQueue(db_url)
+    leases.register(shards)
+    logger.info(f"🧩 Período {start_date:%d/%m/%Y} a {end_date:%d/%m/%Y} dividido em {len(shards)} shards "
+                f"({granularity}), {workers} workers")
+
+    # "spawn" evita herdar conexões do banco e estado do Chrome do processo pai
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(run_shard_worker, engine, headless, max_publications, db_url)
+            for _ in range(workers)
+        ]
+        discovered = sum(future.result()[1] for future in futures)
+
+    counts = leases.counts(shards)
+    logger.info(f"🧩 Shards: {counts} | {discovered} publicações novas na fila")
+    discovery_seconds = time.monotonic() - start
+
+    pipeline = StagedPipeline(headless=headless, engine=engine, download_workers=download_workers,
+                              queue=JobQueue(db_url))
+    success = pipeline.run(resume=True)
+
+    summary = dict(pipeline.stats)
+    summary.update({
+        "success": success and not counts.get(SHARD_FAILED),
+        "shards": len(shards),
+        "failed_shards": counts.get(SHARD_FAILED, 0),
+        "discovered": discovered,
+        "discovery_seconds": discovery_seconds,
+        "seconds": time.monotonic() - start,
+    })
+    return summary
@@ -0,0 +1,121 @@
+"""
+Compara os perfis do Chrome ("standard" e "lean") carregando a página do DOM
+várias vezes e medindo tempo de inicialização, tempo de carregamento,
+recursos transferidos e memória.
+
+Uso (a partir da raiz do repositório):
+    python scripts/benchmark_profiles.py --runs 5
+    python scripts/benchmark_profiles.py --url https://www.natal.rn.gov.br/dom --profiles standard,lean
+
+A memória do processo (RSS do Chrome e filhos) requer ``psutil``; sem ele,
+apenas o heap JavaScript é informado.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from services.browser_pool import PROFILES, create_driver
+from services.scraper import PrefeituraScraper
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+NAVIGATION_METRICS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    load_ms: nav ? nav.loadEventEnd - nav.startTime : null,
+    dom_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    resources: resources.length,
+    transfer_kb: resources.reduce((total, r) => total + (r.transferSize || 0), 0) / 1024,
+    heap_mb: performance.memory ? performance.memory.usedJSHeapSize / 1048576 : null,
+};
+"""
+
+def browser_rss_mb(driver):
+    if psutil is None:
+        return None
+    try:
+        service = psutil.Process(driver.service.process.pid)
+        processes = [service] + service.children(recursive=True)
+        return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+    except (psutil.Error, AttributeError):
+        return None
+
+def wait_document_complete(driver, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if driver.execute_script("return document.readyState") == "complete":
+            return True
+        time.sleep(0.05)
+    return False
+
+def benchmark_profile(profile, url, runs, headless):
+    download_dir = tempfile.mkdtemp(prefix=f"bench-{profile}-")
+    start = time.monotonic()
+    driver = create_driver(headless, download_dir, profile)
+    startup = time.monotonic() - start
+    samples = []
+    try:
+        for _ in range(runs):
+            driver.get("about:blank")
+            start = time.monotonic()
+            driver.get(url)
+            wait_document_complete(driver)
+            wall_ms = (time.monotonic() - start) * 1000
+            metrics = driver.execute_script(NAVIGATION_METRICS_JS)
+            metrics["wall_ms"] = wall_ms
+            metrics["rss_mb"] = browser_rss_mb(driver)
+            samples.append(metrics)
+    finally:
+        driver.quit()
+    return startup, samples
+
+def summarize(values):
+    values = [value for value in values if value is not None]
+    if not values:
+        return "n/d"
+    values.sort()
+    p95 = values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))]
+    return f"{statistics.median(values):.1f} (p95 {p95:.1f})"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos perfis do Chrome usados pelo scraper")
+    parser.add_argument("--url", default=PrefeituraScraper.BASE_URL, help="Página a carregar")
+    parser.add_argument("--runs", type=int, default=5, help="Carregamentos por perfil")
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="Perfis a comparar, separados por vírgula")
+    parser.add_argument("--no-headless", action="store_true", help="Executa o navegador em modo visível")
+    args = parser.parse_args()
+
+    results = {}
+    for profile in args.profiles.split(","):
+        print(f"⏱️ Medindo perfil '{profile}' ({args.runs} carregamentos de {args.url})...")
+        results[profile] = benchmark_profile(profile, args.url, args.runs, not args.no_headless)
+
+    columns = [
+        ("wall_ms", "Carregamento (ms)"),
+        ("load_ms", "loadEventEnd (ms)"),
+        ("resources", "Recursos"),
+        ("transfer_kb", "Transferido (KB)"),
+        ("heap_mb", "Heap JS (MB)"),
+        ("rss_mb", "RSS Chrome (MB)"),
+    ]
+    print("\n📊 RESULTADOS (mediana e p95)")
+    print("=" * 50)
+    for profile, (startup, samples) in results.items():
+        print(f"\nPerfil: {profile}")
+        print(f"  Inicialização do driver: {startup:.2f}s")
+        for key, label in columns:
+            print(f"  {label}: {summarize([sample[key] for sample in samples])}")
+    if psutil is None:
+        print("\nℹ️ Instale psutil para medir a memória (RSS) do Chrome")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Benchmark dos motores de scraping contra a réplica local do DOM
+(``replay_server.py``), sem acesso à rede.
+
+Para cada motor (``http`` e ``selenium``) a listagem é descoberta e os PDFs
+são baixados num processo separado, e o script informa:
+- páginas de listagem por segundo;
+- downloads por segundo;
+- pico de memória (RSS) do processo e dos filhos (Chrome/chromedriver);
+- tempo de cada etapa e os histogramas de ``core.metrics``.
+
+Uso (a partir da raiz do repositório):
+    python scripts/benchmark_scraper.py --engines http --pages 20 --latency 0.1
+    python scripts/benchmark_scraper.py --recordings downloads --runs 3 --output benchmark.json
+
+O processo termina com código 1 se algum motor falhar, para uso em CI. As
+variáveis de ambiente do scraper (``SCRAPER_PAGINATION_WORKERS``,
+``DOWNLOAD_WORKERS``, ``DOWNLOAD_RATE_PER_HOST``, ``SCRAPER_CHROME_PROFILE``...)
+valem também aqui.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "..", "app"))
+
+from replay_server import ReplaySite, ReplayServer
+
+ENGINES = ["http", "selenium"]
+RESULT_MARKER = "BENCHMARK_RESULT "
+DATE_RANGE = (datetime(2025, 7, 1), datetime(2025, 7, 31))
+
+def peak_rss_mb(who):
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_engine(engine, base_url, max_publications, headless):
+    """Executado no processo filho: descoberta + downloads de um motor."""
+    from services.base_scraper import BaseScraper
+    from services.scraper import PrefeituraScraper
+    from services.http_scraper import HttpPrefeituraScraper
+    from services.downloader import ConcurrentDownloader
+    from core.metrics import REGISTRY, Histogram
+
+    download_dir = tempfile.mkdtemp(prefix=f"bench-{engine}-")
+    BaseScraper.BASE_URL = f"{base_url}/dom"
+    BaseScraper.DOWNLOAD_PATH = Path(download_dir)
+    stages = {}
+
+    def timed(stage, func):
+        start = time.monotonic()
+        try:
+            return func()
+        finally:
+            stages[stage] = time.monotonic() - start
+
+    if engine == "http":
+        scraper = HttpPrefeituraScraper(max_publications=max_publications, date_range=DATE_RANGE)
+    else:
+        scraper = PrefeituraScraper(headless=headless, max_publications=max_publications, date_range=DATE_RANGE)
+
+    try:
+        if engine == "selenium":
+            timed("startup", scraper.init_driver)
+        publications = timed("discover", scraper.discover)
+        publications = scraper.limit_publications(publications)
+        if engine == "http":
+            downloader = ConcurrentDownloader(workers=scraper.download_workers, timeout=scraper.timeout, session=scraper.session)
+            downloaded = timed("download", lambda: downloader.download_all(publications, scraper.build_file_path)[0])
+        else:
+            downloaded = timed("download", lambda: scraper.download_publications(publications))
+    finally:
+        timed("close", scraper.close)
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+    histograms = {}
+    for name, metric in REGISTRY._metrics.items():
+        if not isinstance(metric, Histogram):
+            continue
+        for key, series in metric.snapshot().items():
+            label = ",".join(f"{k}={v}" for k, v in key)
+            histograms[f"{name}{{{label}}}" if label else name] = {"count": series["count"], "sum": series["sum"]}
+
+    return {
+        "publications": len(publications),
+        "downloads": len(downloaded),
+        "stages": stages,
+        "rss_mb": peak_rss_mb(resource.RUSAGE_SELF),
+        "children_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "histograms": histograms,
+    }
+
+def run_child(args):
+    os.environ["SCRAPER_DEBUG_ARTIFACTS"] = "off"
+    result = run_engine(args.child, args.base_url, args.max_publications, not args.no_headless)
+    print(RESULT_MARKER + json.dumps(result), flush=True)
+
+def benchmark_engine(engine, server, args):
+    requests_before = dict(server.requests)
+    command = [
+        sys.executable, os.path.abspath(__file__), "--child", engine,
+        "--base-url", server.base_url, "--max-publications", str(args.max_publications),
+    ]
+    if args.no_headless:
+        command.append("--no-headless")
+    completed = subprocess.run(
+        command, stdout=subprocess.PIPE, stderr=None if args.verbose else subprocess.PIPE,
+        text=True, timeout=args.timeout,
+    )
+    lines = [line for line in completed.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+    if completed.returncode != 0 or not lines:
+        error = (completed.stderr or "").strip().splitlines()[-5:]
+        raise RuntimeError("\n".join(error) or f"processo terminou com código {completed.returncode}")
+
+    result = json.loads(lines[-1][len(RESULT_MARKER):])
+    result["requests"] = {kind: server.requests[kind] - requests_before[kind] for kind in server.requests}
+    discover = result["stages"].get("discover") or 0
+    download = result["stages"].get("download") or 0
+    result["pages_per_second"] = result["requests"]["listing"] / discover if discover else 0.0
+    result["downloads_per_second"] = result["downloads"] / download if download else 0.0
+    return result
+
+def median(results, getter):
+    values = [getter(result) for result in results]
+    return statistics.median(values) if values else 0.0
+
+def print_report(engine, results):
+    print(f"\nMotor: {engine} ({len(results)} execução(ões), medianas)")
+    print(f"  Publicações: {median(results, lambda r: r['publications']):.0f} | downloads: {median(results, lambda r: r['downloads']):.0f}")
+    print(f"  Páginas de listagem: {median(results, lambda r: r['requests']['listing']):.0f} "
+          f"({median(results, lambda r: r['pages_per_second']):.2f} páginas/s)")
+    print(f"  Downloads/s: {median(results, lambda r: r['downloads_per_second']):.2f}")
+    print(f"  Pico de RSS: {median(results, lambda r: r['rss_mb']):.1f} MB (filhos: {median(results, lambda r: r['children_rss_mb']):.1f} MB)")
+    for stage in results[0]["stages"]:
+        print(f"  Etapa {stage}: {median(results, lambda r: r['stages'].get(stage, 0)):.2f}s")
+    for name in sorted(results[0]["histograms"]):
+        count = median(results, lambda r: r["histograms"].get(name, {}).get("count", 0))
+        total = median(results, lambda r: r["histograms"].get(name, {}).get("sum", 0))
+        print(f"  {name}: {total:.2f}s em {count:.0f} operações")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de scraping contra a réplica local do DOM")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="Motores a medir, separados por vírgula")
+    parser.add_argument("--runs", type=int, default=1, help="Execuções por motor")
+    parser.add_argument("--recordings", help="Diretório com páginas .html e PDFs gravados")
+    parser.add_argument("--pages", type=int, default=10, help="Páginas da listagem sintética")
+    parser.add_argument("--rows", type=int, default=20, help="Publicações por página")
+    parser.add_argument("--pdf-kb", type=int, default=200, help="Tamanho do PDF sintético (KB)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latência por requisição (segundos)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variação aleatória da latência (segundos)")
+    parser.add_argument("--max-publications", type=int, default=100, help="Limite de PDFs baixados por execução")
+    parser.add_argument("--timeout", type=int, default=900, help="Tempo máximo por execução (segundos)")
+    parser.add_argument("--output", help="Grava os resultados em JSON")
+    parser.add_argument("--no-headless", action="store_true", help="Executa o navegador em modo visível")
+    parser.add_argument("--verbose", action="store_true", help="Mostra os logs do scraper")
+    parser.add_argument("--child", choices=ENGINES, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    site = ReplaySite(args.recordings, pages=args.pages, rows=args.rows, pdf_kb=args.pdf_kb)
+    server = ReplayServer(site, latency=args.latency, jitter=args.jitter).start()
+    print(f"🛰️ Réplica do DOM em {server.base_url}/dom ({site.pages} páginas, latência {args.latency}s)")
+
+    report = {}
+    failed = []
+    try:
+        for engine in args.engines.split(","):
+            results = []
+            for run in range(1, args.runs + 1):
+                print(f"⏱️ Medindo motor '{engine}' (execução {run}/{args.runs})...")
+                try:
+                    results.append(benchmark_engine(engine, server, args))
+                except (RuntimeError, subprocess.TimeoutExpired) as e:
+                    print(f"❌ Motor '{engine}' falhou: {str(e)}")
+                    failed.append(engine)
+                    break
+            if results:
+                report[engine] = results
+    finally:
+        server.stop()
+
+    print("\n📊 RESULTADOS")
+    print("=" * 50)
+    for engine, results in report.items():
+        print_report(engine, results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": {k: v for k, v in vars(args).items() if k not in ("child", "base_url")}, "results": report}, f, indent=2)
+        print(f"\n💾 Resultados gravados em {args.output}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ CREATE DATABASE natal_prefeitura WITH ENCODING 'UTF8';
 
 \c natal_prefeitura;
 
+-- Em bancos já existentes a constraint única é criada na inicialização da aplicação
+-- (core.database.migrate_schema), que antes remove as duplicatas.
 CREATE TABLE IF NOT EXISTS publications (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
@@ -10,7 +12,70 @@ CREATE TABLE IF NOT EXISTS publications (
     original_link TEXT,
     file_path TEXT,
     file_url TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_publications_title_publication_date UNIQUE (title, publication_date)
 );
 
-CREATE INDEX IF NOT EXISTS idx_publications_competence ON publications(competence);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_publications_competence ON publications(competence);
+CREATE INDEX IF NOT EXISTS idx_publications_date_id ON publications(publication_date, id);
+
+CREATE TABLE IF NOT EXISTS scrape_state (
+    id SERIAL PRIMARY KEY,
+    source VARCHAR(50) NOT NULL UNIQUE,
+    last_publication_date TIMESTAMP NOT NULL,
+    last_link TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS pipeline_jobs (
+    id SERIAL PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    title VARCHAR(255) NOT NULL,
+    publication_date TIMESTAMP NOT NULL,
+    competence VARCHAR(7) NOT NULL,
+    stage VARCHAR(20) NOT NULL DEFAULT 'discovered',
+    file_path TEXT,
+    checksum VARCHAR(64),
+    file_url TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    locked_by VARCHAR(100),
+    locked_until TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_stage_id ON pipeline_jobs(stage, id);
+
+CREATE TABLE IF NOT EXISTS shard_leases (
+    id SERIAL PRIMARY KEY,
+    start_date TIMESTAMP NOT NULL,
+    end_date TIMESTAMP NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    owner VARCHAR(100),
+    lease_expires_at TIMESTAMP,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    publications INTEGER,
+    last_error TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_shard_leases_period UNIQUE (start_date, end_date)
+);
+
+CREATE TABLE IF NOT EXISTS uploaded_files (
+    id SERIAL PRIMARY KEY,
+    checksum VARCHAR(64) NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    file_name TEXT,
+    size INTEGER,
+    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS publication_texts (
+    id SERIAL PRIMARY KEY,
+    publication_id INTEGER NOT NULL UNIQUE REFERENCES publications(id) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector tsvector GENERATED ALWAYS AS (to_tsvector('portuguese', content)) STORED
+);
+
+CREATE INDEX IF NOT EXISTS idx_publication_texts_search ON publication_texts USING GIN (search_vector);
@@ -0,0 +1,268 @@
+"""
+Servidor HTTP local que imita o Diário Oficial de Natal para testar o scraper
+sem acesso à rede.
+
+Rotas servidas:
+    /dom                      página inicial com o formulário de datas
+    /dom/pesquisa?...&page=N  listagem paginada (paginação numerada + "Próximo")
+    /dom/doc/<id>             página da publicação com o link do PDF
+    /files/<id>.pdf           o PDF
+
+Com ``--recordings`` as páginas e PDFs gravados são reaproveitados: arquivos
+``.html`` que contêm a tabela de resultados (ex.: ``results_page.html``,
+``page_source.html`` ou capturas de ``SCRAPER_DEBUG_ARTIFACTS=always``) viram as
+páginas da listagem, em ordem alfabética, e os ``.pdf`` são servidos em rodízio.
+Links absolutos para o site real são reescritos para o servidor local. Sem
+gravações (ou para as páginas que faltarem), a listagem é sintética, com datas
+distribuídas no período pesquisado.
+
+Uso (a partir da raiz do repositório):
+    python scripts/replay_server.py --port 8765 --pages 20 --latency 0.15
+    python scripts/replay_server.py --recordings downloads --latency 0.3 --jitter 0.1
+
+Para apontar os scrapers para ele, altere ``BaseScraper.BASE_URL`` para
+``http://127.0.0.1:<porta>/dom`` (é o que ``benchmark_scraper.py`` faz).
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from services.listing_parser import parse_listing
+
+SITE_URL_PATTERN = re.compile(r"https?://(www\.)?natal\.rn\.gov\.br", re.IGNORECASE)
+
+HOME_PAGE = """<html><head><title>DOM - Natal</title></head><body>
+<div class="container"><main>
+<form action="/dom/pesquisa" method="get">
+  <label for="dataInicial">Data inicial</label><input id="dataInicial" name="dataInicial" type="text" placeholder="data inicial">
+  <label for="dataFinal">Data final</label><input id="dataFinal" name="dataFinal" type="text" placeholder="data final">
+  <button type="submit" class="btn btn-primary">Pesquisar</button>
+</form>
+</main></div></body></html>"""
+
+def build_pdf(size):
+    """PDF mínimo válido (com tabela xref, que leitores como o pypdf exigem),
+    completado com um comentário até ``size`` bytes."""
+    objects = [
+        b"<</Type/Catalog/Pages 2 0 R>>",
+        b"<</Type/Pages/Kids[3 0 R]/Count 1>>",
+        b"<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>",
+    ]
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(body))
+        body += b"%d 0 obj" % number + obj + b"endobj\n"
+
+    # Cada entrada da xref tem exatamente 20 bytes
+    xref = b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    xref += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    trailer = b"trailer<</Size %d/Root 1 0 R>>\nstartxref\n" % (len(objects) + 1)
+    # O preenchimento fica antes da xref; o startxref de largura fixa mantém o tamanho exato
+    end = len(b"%010d\n%%%%EOF\n" % 0)
+    padding = max(0, size - len(body) - len(xref) - len(trailer) - end - 2)
+    xref_offset = len(body) + padding + 2
+    return body + b"%" + b"0" * padding + b"\n" + xref + trailer + b"%010d\n%%%%EOF\n" % xref_offset
+
+def parse_br_date(value, default):
+    try:
+        return datetime.strptime(value, "%d/%m/%Y")
+    except (TypeError, ValueError):
+        return default
+
+class ReplaySite:
+    """Conteúdo do site replicado: listagem (gravada ou sintética) e PDFs."""
+
+    def __init__(self, recordings=None, pages=10, rows=20, pdf_kb=200, window=0):
+        self.pages = pages
+        self.rows = rows
+        self.window = window
+        self.recorded_pages = []
+        self.recorded_pdfs = []
+        if recordings:
+            self.load_recordings(Path(recordings))
+        self.synthetic_pdf = build_pdf(pdf_kb * 1024)
+
+    def load_recordings(self, directory):
+        for path in sorted(directory.rglob("*.html")):
+            html = path.read_text(encoding="utf-8", errors="replace")
+            if parse_listing(html, "http://localhost/"):
+                self.recorded_pages.append(html)
+        self.recorded_pdfs = [path.read_bytes() for path in sorted(directory.rglob("*.pdf"))[:50]]
+        print(f"📼 {len(self.recorded_pages)} páginas de listagem e {len(self.recorded_pdfs)} PDFs gravados carregados de {directory}")
+        if self.recorded_pages:
+            self.pages = max(self.pages, len(self.recorded_pages))
+
+    def pagination(self, page, query):
+        first, last = 1, self.pages
+        if self.window:
+            first, last = max(1, page - self.window), min(self.pages, page + self.window)
+        items = []
+        for number in range(first, last + 1):
+            href = "/dom/pesquisa?" + urlencode(dict(query, page=number))
+            active = ' class="page-item active"' if number == page else ' class="page-item"'
+            items.append(f'<li{active}><a class="page-link" href="{href}">{number}</a></li>')
+        if page < self.pages:
+            href = "/dom/pesquisa?" + urlencode(dict(query, page=page + 1))
+            items.append(f'<li class="page-item next"><a class="page-link" href="{href}">Próximo</a></li>')
+        else:
+            items.append('<li class="page-item next disabled"><a class="page-link" href="#">Próximo</a></li>')
+        return f'<ul class="pagination">{"".join(items)}</ul>'
+
+    def listing(self, page, query, base_url):
+        pagination = self.pagination(page, query)
+        if page <= len(self.recorded_pages):
+            html = SITE_URL_PATTERN.sub(base_url, self.recorded_pages[page - 1])
+            if "pagination" not in html:
+                html = html.replace("</body>", pagination + "</body>") if "</body>" in html else html + pagination
+            return html
+
+        end_date = parse_br_date(query.get("dataFinal"), datetime.now())
+        start_date = parse_br_date(query.get("dataInicial"), end_date - timedelta(days=30))
+        total = self.pages * self.rows
+        span = max((end_date - start_date).days, 0)
+        rows = []
+        for row in range(self.rows):
+            index = (page - 1) * self.rows + row
+            # Mais recentes primeiro, como no site
+            date = end_date - timedelta(days=span * index // max(total - 1, 1))
+            rows.append(
+                f"<tr><td>{date.strftime('%d/%m/%Y')}</td>"
+                f"<td>Diário Oficial nº {total - index} - Edição {page}.{row + 1}</td>"
+                f'<td><a href="/dom/doc/{page}-{row + 1}">Visualizar</a></td></tr>'
+            )
+        return (
+            '<html><body><div class="container"><div class="table-responsive">'
+            '<table class="table"><thead><tr><th>Data</th><th>Descrição</th><th>Arquivo</th></tr></thead>'
+            f'<tbody>{"".join(rows)}</tbody></table></div>{pagination}</div></body></html>'
+        )
+
+    def document(self, doc_id):
+        return f'<html><body><a href="/files/{doc_id}.pdf">Baixar PDF</a></body></html>'
+
+    def pdf(self, name):
+        if self.recorded_pdfs:
+            return self.recorded_pdfs[sum(name.encode()) % len(self.recorded_pdfs)]
+        return self.synthetic_pdf
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        server = self.server
+        if server.latency or server.jitter:
+            time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+        server.count(self.path)
+
+        url = urlparse(self.path)
+        site = server.site
+        base_url = f"http://{self.headers.get('Host', '127.0.0.1')}"
+        if url.path.rstrip("/") in ("", "/dom"):
+            self.send_body(HOME_PAGE.encode("utf-8"), "text/html; charset=utf-8")
+        elif url.path.startswith("/dom/pesquisa"):
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            try:
+                page = int(query.pop("page", "1"))
+            except ValueError:
+                page = 1
+            if page < 1 or page > site.pages:
+                self.send_body(b"pagina inexistente", "text/plain", status=404)
+                return
+            self.send_body(site.listing(page, query, base_url).encode("utf-8"), "text/html; charset=utf-8")
+        elif url.path.lower().endswith(".pdf"):
+            self.send_body(site.pdf(url.path), "application/pdf")
+        elif url.path.startswith("/dom/"):
+            doc_id = url.path.rstrip("/").rsplit("/", 1)[-1]
+            self.send_body(site.document(doc_id).encode("utf-8"), "text/html; charset=utf-8")
+        else:
+            self.send_body(b"nao encontrado", "text/plain", status=404)
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, site, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, verbose=False):
+        super().__init__((host, port), ReplayHandler)
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.verbose = verbose
+        self.requests = {"listing": 0, "document": 0, "pdf": 0, "other": 0}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, path):
+        kind = "other"
+        if path.startswith("/dom/pesquisa"):
+            kind = "listing"
+        elif urlparse(path).path.lower().endswith(".pdf"):
+            kind = "pdf"
+        elif path.startswith("/dom/"):
+            kind = "document"
+        with self._lock:
+            self.requests[kind] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Réplica local do Diário Oficial de Natal para testes do scraper")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--recordings", help="Diretório com páginas .html e PDFs gravados")
+    parser.add_argument("--pages", type=int, default=10, help="Páginas da listagem sintética")
+    parser.add_argument("--rows", type=int, default=20, help="Publicações por página")
+    parser.add_argument("--pdf-kb", type=int, default=200, help="Tamanho do PDF sintético (KB)")
+    parser.add_argument("--window", type=int, default=0, help="Exibe só N páginas antes/depois da atual na paginação (0 = todas)")
+    parser.add_argument("--latency", type=float, default=0.1, help="Latência por requisição (segundos)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variação aleatória da latência (segundos)")
+    parser.add_argument("--verbose", action="store_true", help="Registra cada requisição")
+    args = parser.parse_args()
+
+    site = ReplaySite(args.recordings, pages=args.pages, rows=args.rows, pdf_kb=args.pdf_kb, window=args.window)
+    server = ReplayServer(site, args.host, args.port, args.latency, args.jitter, args.verbose)
+    print(f"🛰️ Réplica do DOM em {server.base_url}/dom ({site.pages} páginas, latência {args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nRequisições atendidas: {server.requests}")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, text
+from sqlalchemy import create_engine, select, tuple_, Column, Integer, String, DateTime, Text, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 import uvicorn
 import os
+import base64
 import logging
 from datetime import datetime
+from typing import Optional
 import sys
 
 logging.basicConfig(
@@ -35,24 +37,21 @@ Publication = None
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./test.db")
 logger.info(f"Usando string de conexão: {DATABASE_URL.split('@')[0]}@******")
 
+def engine_options(database_url):
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+    }
+    if not database_url.startswith("sqlite"):
+        options.update({
+            "pool_size": int(os.environ.get("DB_POOL_SIZE", "10")),
+            "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "20")),
+        })
+    return options
+
 try:
-    engine = create_engine(DATABASE_URL)
-    
-    # NOVO: Bloco de diagnóstico detalhado para depuração
-    try:
-        # Apenas para depuração
-        import sqlalchemy
-        test_engine = sqlalchemy.create_engine(DATABASE_URL)
-        with test_engine.connect() as conn:
-            # CORRIGIDO: Usando text() para criar um objeto SQL executável
-            result = conn.execute(text("SELECT 1")).fetchone()
-            logger.info(f"✅ TESTE DE CONEXÃO BEM SUCEDIDO: {result}")
-    except Exception as e:
-        logger.error(f"❌ ERRO DE CONEXÃO DETALHADO: {str(e)}")
-        logger.error(f"TIPO DE ERRO: {type(e).__name__}")
-        # Mais detalhes se for disponível
-        if hasattr(e, 'orig'):
-            logger.error(f"ERRO ORIGINAL: {e.orig}")
+    # Engine único para toda a aplicação; o pre-ping descarta conexões mortas do pool
+    engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
     
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     Base = declarative_base()
@@ -60,6 +59,9 @@ try:
     # Definir modelo
     class Publication(Base):
         __tablename__ = "publications"
+        __table_args__ = (
+            Index("idx_publications_date_id", "publication_date", "id"),
+        )
         
         id = Column(Integer, primary_key=True)
         title = Column(String(255), nullable=False)
@@ -97,6 +99,40 @@ except Exception as e:
     logger.warning(f"⚠️ Erro ao configurar banco de dados: {str(e)}")
     logger.info("API funcionará em modo demonstração")
 
+PUBLIC_FIELDS = ["id", "title", "publication_date", "competence", "original_link", "file_url", "created_at"]
+
+def parse_fields(fields):
+    if not fields:
+        return list(PUBLIC_FIELDS)
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    invalid = [field for field in selected if field not in PUBLIC_FIELDS]
+    if invalid:
+        raise ValueError(f"Campos inválidos: {', '.join(invalid)}. Campos disponíveis: {', '.join(PUBLIC_FIELDS)}")
+    return selected
+
+def encode_cursor(publication_date, publication_id):
+    raw = f"{publication_date.isoformat()}|{publication_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date_str, id_str = raw.split("|")
+        return datetime.fromisoformat(date_str), int(id_str)
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+def serialize_row(row, fields):
+    data = {}
+    for field in fields:
+        value = row[field]
+        if field == "publication_date":
+            value = value.strftime("%Y-%m-%d")
+        elif field == "created_at" and value is not None:
+            value = value.strftime("%Y-%m-%d %H:%M:%S")
+        data[field] = value
+    return data
+
 # Dependência para obter a sessão do DB
 def get_db():
     if not has_database:
@@ -122,7 +158,7 @@ async def root():
         "endpoints": [
             {"path": "/", "description": "Informações da API"},
             {"path": "/health", "description": "Verificação de saúde da API"},
-            {"path": "/arquivos", "description": "Lista todas as publicações"},
+            {"path": "/arquivos", "description": "Lista publicações paginadas (parâmetros: limit, cursor, fields)"},
             {"path": "/arquivos/{competencia}", "description": "Lista publicações por competência (YYYY-MM)"}
         ]
     }
@@ -150,7 +186,18 @@ async def health_check():
     }
 
 @app.get("/arquivos")
-async def list_publications(db: Session = Depends(get_db)):
+async def list_publications(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        selected_fields = parse_fields(fields)
+        cursor_key = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     if db is None:
         # Retornar dados de demonstração
         return {
@@ -179,10 +226,25 @@ async def list_publications(db: Session = Depends(get_db)):
         }
     
     try:
-        publications = db.query(Publication).order_by(Publication.publication_date.desc()).all()
+        columns = [getattr(Publication, field) for field in selected_fields]
+        for key_column in (Publication.publication_date, Publication.id):
+            if key_column.key not in selected_fields:
+                columns.append(key_column)
+
+        query = select(*columns).order_by(Publication.publication_date.desc(), Publication.id.desc())
+        if cursor_key:
+            query = query.where(tuple_(Publication.publication_date, Publication.id) < tuple_(*cursor_key))
+        rows = [row._mapping for row in db.execute(query.limit(limit + 1)).fetchall()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["publication_date"], rows[-1]["id"])
+
         return {
-            "total": len(publications),
-            "publicacoes": [pub.to_dict() for pub in publications]
+            "total": len(rows),
+            "publicacoes": [serialize_row(row, selected_fields) for row in rows],
+            "proximo_cursor": next_cursor
         }
     except Exception as e:
         logger.error(f"Erro ao listar publicações: {str(e)}")
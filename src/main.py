@@ -48,9 +48,10 @@ def run_full_process(headless=True):
             logger.warning("⚠️ Nenhum arquivo foi enviado com sucesso para 0x0.st")
             return False
 
-        for i, pub in enumerate(publications):
-            if i < len(uploaded_urls):
-                pub['file_url'] = uploaded_urls[i]
+        for pub in publications:
+            if pub.get('file_path'):
+                pub['file_url'] = uploaded_urls.get(str(pub['file_path']))
+        publications = [pub for pub in publications if pub.get('file_url')]
         
         logger.info(f"✅ Upload concluído. {len(uploaded_urls)} arquivos enviados para 0x0.st")
 
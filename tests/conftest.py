@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core import cache
+
+@pytest.fixture(autouse=True)
+def response_cache_dir(tmp_path, monkeypatch):
+    """Cada teste usa um cache de respostas próprio, fora do diretório temporário compartilhado."""
+    monkeypatch.setenv("RESPONSE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("RESPONSE_CACHE_BACKEND", raising=False)
+    cache._response_cache = None
+    yield tmp_path / "cache"
+    cache._response_cache = None
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
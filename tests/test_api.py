@@ -0,0 +1,141 @@
+import io
+import csv
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core import database
+from core.database import DatabaseManager, decode_cursor, encode_cursor, get_engine, init_db
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """API servindo um SQLite temporário; ``api.seed`` grava publicações pelo caminho do scraper
+    e ``api.db`` dá acesso ao ``DatabaseManager``."""
+    path = tmp_path / "api.db"
+    # A API cria o gerenciador assíncrono na importação, com a URL padrão
+    monkeypatch.setattr(database, "build_database_url", lambda driver="postgresql": f"sqlite+aiosqlite:///{path}")
+    import api as api_module
+    from core.cache import get_response_cache
+
+    monkeypatch.setattr(api_module, "db_manager", database.AsyncDatabaseManager(f"sqlite+aiosqlite:///{path}"))
+    monkeypatch.setattr(api_module, "response_cache", get_response_cache())
+    init_db(get_engine(f"sqlite:///{path}"))
+    db = DatabaseManager(f"sqlite:///{path}")
+    with TestClient(api_module.app) as client:
+        client.seed = db.save_publications
+        client.db = db
+        yield client
+
+def publications(count, competence="2025-07"):
+    year, month = map(int, competence.split("-"))
+    return [
+        {
+            "title": f"Publicação {i}",
+            # Vários itens no mesmo dia: o desempate da paginação é pelo id
+            "date": datetime(year, month, 1 + i // 3),
+            "competence": competence,
+            "link": f"https://example.com/{competence}/{i}",
+            "file_url": f"https://0x0.st/{competence}-{i}.pdf",
+        }
+        for i in range(count)
+    ]
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(datetime(2025, 7, 10, 8, 30), 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (datetime(2025, 7, 10, 8, 30), 42)
+
+@pytest.mark.parametrize("cursor", ["", "lixo", encode_cursor(datetime(2025, 7, 1), 1)[:-3] + "@@@"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+def test_pages_cover_every_publication_once(api):
+    api.seed(publications(25))
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 7}
+        if cursor:
+            params["cursor"] = cursor
+        body = api.get("/arquivos", params=params).json()
+        seen.extend(pub["id"] for pub in body["publicacoes"])
+        cursor = body["proximo_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+
+def test_selected_fields(api):
+    api.seed(publications(2))
+    body = api.get("/arquivos", params={"fields": "id,file_url"}).json()
+    assert [set(pub) for pub in body["publicacoes"]] == [{"id", "file_url"}] * 2
+
+def test_invalid_cursor_is_400(api):
+    response = api.get("/arquivos", params={"cursor": "lixo"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
+
+def test_invalid_field_is_400(api):
+    response = api.get("/arquivos", params={"fields": "id,senha"})
+    assert response.status_code == 400
+    assert "senha" in response.json()["detail"]
+
+@pytest.mark.parametrize("limit", [0, 1001])
+def test_limit_out_of_range_is_rejected(api, limit):
+    assert api.get("/arquivos", params={"limit": limit}).status_code == 422
+
+@pytest.mark.parametrize("competencia", ["2025-7", "julho", "2025-13"])
+def test_invalid_competence_is_400(api, competencia):
+    assert api.get(f"/arquivos/{competencia}").status_code == 400
+
+def test_export_ndjson_streams_every_publication(api):
+    api.seed(publications(3) + publications(2, competence="2025-08"))
+    response = api.get("/arquivos/export", params={"fields": "id,competence"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 5
+    assert all(set(row) == {"id", "competence"} for row in rows)
+
+def test_export_csv_by_competence(api):
+    api.seed(publications(3) + publications(2, competence="2025-08"))
+    response = api.get("/arquivos/export", params={"format": "csv", "competencia": "2025-08", "fields": "title,original_link"})
+    assert response.status_code == 200
+    assert 'filename="publicacoes-2025-08.csv"' in response.headers["content-disposition"]
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["title", "original_link"]
+    assert sorted(row[1] for row in rows[1:]) == ["https://example.com/2025-08/0", "https://example.com/2025-08/1"]
+
+def test_export_rejects_invalid_field(api):
+    assert api.get("/arquivos/export", params={"fields": "senha"}).status_code == 400
+    assert api.get("/arquivos/export", params={"format": "xml"}).status_code == 422
+
+def test_search_ranks_matching_texts(api):
+    api.seed(publications(3))
+    ids = [pub["id"] for pub in api.get("/arquivos", params={"fields": "id"}).json()["publicacoes"]]
+    api.db.save_publication_texts([
+        {"publication_id": ids[0], "content": "Decreto nº 123/2025 de licitação. Licitação de obras, licitação de serviços."},
+        {"publication_id": ids[1], "content": "Portaria de nomeação com uma licitação citada."},
+        {"publication_id": ids[2], "content": "Edital de concurso público, sem licitação."},
+    ])
+    # Termo presente em todos os textos: o bm25 do SQLite fica na casa de 1e-6
+    body = api.get("/busca", params={"q": "licitação"}).json()
+    assert body["total"] == 3
+    ranks = [result["rank"] for result in body["resultados"]]
+    assert all(rank > 0 for rank in ranks)
+    assert ranks[0] > ranks[1] > ranks[2]
+    assert body["resultados"][0]["id"] == ids[0]
+    assert "<mark>" in body["resultados"][0]["trecho"]
+    assert api.get("/busca", params={"q": "123/2025"}).json()["total"] == 1
+
+def test_competence_is_cached_with_etag(api):
+    api.seed(publications(2))
+    first = api.get("/arquivos/2025-07")
+    assert first.status_code == 200
+    assert first.json()["total"] == 2
+    etag = first.headers["etag"]
+    assert api.get("/arquivos/2025-07").headers["etag"] == etag
+    assert api.get("/arquivos/2025-07", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from core.database import (
+    DatabaseManager, PUBLICATIONS_UNIQUE_MIGRATION, get_engine, init_db, migrate_schema,
+)
+
+def publication(title, day, link=None):
+    return {
+        "title": title,
+        "date": datetime(2025, 7, day),
+        "competence": "2025-07",
+        "link": link or f"https://example.com/{title}",
+        "file_url": f"https://0x0.st/{title}.pdf",
+    }
+
+@pytest.fixture
+def db(db_url):
+    init_db(get_engine(db_url))
+    return DatabaseManager(db_url)
+
+def test_save_publications_skips_duplicates_in_batch_and_table(db):
+    assert db.save_publications([publication("A", 1), publication("A", 1), publication("B", 1)]) == 2
+    assert db.save_publications([publication("A", 1), publication("C", 2)]) == 1
+    assert sorted(pub["title"] for pub in db.get_all_publications()) == ["A", "B", "C"]
+
+def test_same_title_on_another_day_is_a_new_publication(db):
+    assert db.save_publications([publication("A", 1), publication("A", 2)]) == 2
+
+def test_save_publications_in_several_batches(db, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "BATCH_SIZE", 2)
+    pubs = [publication(f"P{i}", 1 + i % 28) for i in range(7)]
+    assert db.save_publications(pubs + pubs[:3]) == 7
+
+def test_save_publications_raise_errors(db):
+    broken = dict(publication("A", 1), title=None)
+    assert db.save_publications([broken]) == 0
+    with pytest.raises(SQLAlchemyError):
+        db.save_publications([broken], raise_errors=True)
+
+def test_save_publications_invalidates_only_saved_competences(db):
+    from core.cache import get_response_cache
+    response_cache = get_response_cache()
+    july, june = response_cache.competence_key("2025-07"), response_cache.competence_key("2025-06")
+    response_cache.set(july, b"{}")
+    response_cache.set(june, b"{}")
+    db.save_publications([publication("A", 1)])
+    assert response_cache.get(july) is None
+    assert response_cache.get(june) is not None
+
+class RecordingConnection:
+    def __init__(self, dialect_name):
+        self.dialect = type("Dialect", (), {"name": dialect_name})()
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+def test_unique_constraint_migration_only_runs_on_postgresql():
+    sqlite_conn = RecordingConnection("sqlite")
+    migrate_schema(sqlite_conn)
+    assert sqlite_conn.statements == []
+
+    postgres_conn = RecordingConnection("postgresql")
+    migrate_schema(postgres_conn)
+    assert postgres_conn.statements == [PUBLICATIONS_UNIQUE_MIGRATION]
+
+def test_unique_constraint_migration_is_guarded_and_deduplicates_first():
+    sql = PUBLICATIONS_UNIQUE_MIGRATION
+    assert "pg_advisory_xact_lock" in sql
+    assert "IF NOT EXISTS" in sql and "pg_constraint" in sql
+    assert sql.index("DELETE FROM publications") < sql.index("ADD CONSTRAINT uq_publications_title_publication_date")
+    # Mantém a linha mais antiga de cada par (title, publication_date)
+    assert "a.id > b.id" in sql
+
+def test_init_db_is_idempotent(db_url):
+    engine = get_engine(db_url)
+    init_db(engine)
+    init_db(engine)
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.job_queue import (
+    JobQueue, STAGE_DISCOVERED, STAGE_DOWNLOADED, STAGE_UPLOADED, STAGE_PERSISTED,
+)
+
+def publications(count, offset=0):
+    return [
+        {
+            "title": f"Publicação {i}",
+            "date": datetime(2025, 7, 1),
+            "competence": "2025-07",
+            "link": f"https://example.com/{i}",
+        }
+        for i in range(offset, offset + count)
+    ]
+
+@pytest.fixture
+def queue(db_url):
+    return JobQueue(db_url, max_attempts=2, lease_seconds=60, worker_id="teste")
+
+def test_enqueue_deduplicates_by_link(queue):
+    assert queue.enqueue(publications(3) + publications(1)) == 3
+    assert queue.enqueue(publications(4)) == 1
+    assert queue.counts()[STAGE_DISCOVERED] == 4
+
+def test_enqueue_in_batches(queue, monkeypatch):
+    monkeypatch.setattr(JobQueue, "BATCH_SIZE", 2)
+    assert queue.enqueue(publications(5)) == 5
+
+def test_known_jobs_keep_their_stage(queue):
+    queue.enqueue(publications(1))
+    job = queue.claim(STAGE_DISCOVERED)[0]
+    queue.advance(job["job_id"], STAGE_DOWNLOADED, file_path="a.pdf", checksum="abc")
+    queue.enqueue(publications(1))
+    assert queue.counts()[STAGE_DOWNLOADED] == 1
+
+def test_claimed_jobs_are_leased(queue):
+    queue.enqueue(publications(3))
+    first = queue.claim(STAGE_DISCOVERED, limit=2)
+    assert len(first) == 2
+    second = queue.claim(STAGE_DISCOVERED, limit=2)
+    assert [job["job_id"] for job in second] == [3]
+    assert queue.claim(STAGE_DISCOVERED) == []
+
+def test_expired_lease_is_claimed_again(db_url):
+    # Lease negativo: o item reservado já nasce expirado, como se o worker tivesse morrido
+    crashed = JobQueue(db_url, lease_seconds=-1, worker_id="morto")
+    crashed.enqueue(publications(1))
+    assert len(crashed.claim(STAGE_DISCOVERED)) == 1
+
+    other = JobQueue(db_url, lease_seconds=60, worker_id="outro")
+    assert [job["job_id"] for job in other.claim(STAGE_DISCOVERED)] == [1]
+    assert other.claim(STAGE_DISCOVERED) == []
+
+def test_advance_moves_through_the_stages(queue):
+    queue.enqueue(publications(1))
+    job = queue.claim(STAGE_DISCOVERED)[0]
+    queue.advance(job["job_id"], STAGE_DOWNLOADED, file_path="a.pdf", checksum="abc")
+    job = queue.claim(STAGE_DOWNLOADED)[0]
+    assert (job["file_path"], job["checksum"]) == ("a.pdf", "abc")
+    queue.advance(job["job_id"], STAGE_UPLOADED, file_url="https://0x0.st/a.pdf")
+    job = queue.claim(STAGE_UPLOADED)[0]
+    assert job["file_url"] == "https://0x0.st/a.pdf"
+    queue.advance(job["job_id"], STAGE_PERSISTED)
+    assert queue.counts() == {STAGE_DISCOVERED: 0, STAGE_DOWNLOADED: 0, STAGE_UPLOADED: 0, STAGE_PERSISTED: 1}
+
+def test_fail_releases_the_job_until_attempts_run_out(queue):
+    queue.enqueue(publications(1))
+    for _ in range(2):
+        job = queue.claim(STAGE_DISCOVERED)[0]
+        queue.fail(job["job_id"], "download falhou")
+    assert queue.claim(STAGE_DISCOVERED) == []
+    assert queue.exhausted() == 1
+
+    assert queue.reset_attempts() == 1
+    assert queue.exhausted() == 0
+    assert len(queue.claim(STAGE_DISCOVERED)) == 1
+
+def test_claimed_before_tries_each_job_once_per_stage(queue):
+    queue.enqueue(publications(5))
+    stage_started = datetime.utcnow()
+    claimed = []
+    while True:
+        jobs = queue.claim(STAGE_DISCOVERED, limit=2, claimed_before=stage_started)
+        if not jobs:
+            break
+        claimed.extend(job["job_id"] for job in jobs)
+        for job in jobs:
+            queue.fail(job["job_id"], "download falhou")
+    assert sorted(claimed) == [1, 2, 3, 4, 5]
+    # Numa próxima etapa/execução os itens com falha voltam a ser tentados
+    assert len(queue.claim(STAGE_DISCOVERED, limit=10, claimed_before=datetime.utcnow() + timedelta(seconds=1))) == 5
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from services.listing_parser import parse_listing, find_page_urls
+
+BASE_URL = "https://www.natal.rn.gov.br/dom"
+
+LISTING = """
+<table>
+  <tr><th>Data</th><th>Título</th><th>Arquivo</th></tr>
+  <tr><td>01/07/2025</td><td>DOM  nº 5.000</td><td><a href="/storage/dom/5000.pdf">Baixar</a></td></tr>
+  <tr><td>2025-07-02</td><td>DOM Extra</td><td>-</td><td><a href="https://cdn.example.com/extra.pdf">PDF</a></td></tr>
+  <tr><td>03/07/2025</td><td>Sem arquivo</td><td></td></tr>
+</table>
+"""
+
+def test_parse_listing_reads_rows_in_one_pass():
+    publications = parse_listing(LISTING, BASE_URL)
+    assert publications == [
+        {
+            "date": datetime(2025, 7, 1),
+            "competence": "2025-07",
+            "title": "DOM nº 5.000",
+            "link": "https://www.natal.rn.gov.br/storage/dom/5000.pdf",
+        },
+        {
+            "date": datetime(2025, 7, 2),
+            "competence": "2025-07",
+            "title": "DOM Extra",
+            "link": "https://cdn.example.com/extra.pdf",
+        },
+    ]
+
+def test_parse_listing_without_table():
+    assert parse_listing("<p>Nenhum resultado</p>", BASE_URL) == []
+    assert parse_listing(None, BASE_URL) == []
+
+def test_find_page_urls_builds_every_page_from_the_template():
+    html = """
+    <ul class="pagination">
+      <li class="disabled"><a href="#">&laquo;</a></li>
+      <li><a href="?data_inicial=01/07/2025&page=2">2</a></li>
+      <li><a href="?data_inicial=01/07/2025&page=3">3</a></li>
+      <li><a href="?data_inicial=01/07/2025&page=5">5</a></li>
+    </ul>
+    """
+    pages = find_page_urls(html, BASE_URL + "?data_inicial=01/07/2025")
+    assert [number for number, _ in pages] == [2, 3, 4, 5]
+    assert pages[2][1] == "https://www.natal.rn.gov.br/dom?data_inicial=01%2F07%2F2025&page=4"
+
+def test_find_page_urls_without_numbered_pagination():
+    html = '<a href="javascript:void(0)">Próximo</a><a href="/dom/sobre">Sobre</a>'
+    assert find_page_urls(html, BASE_URL) == []
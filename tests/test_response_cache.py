@@ -0,0 +1,43 @@
+import os
+import sys
+import subprocess
+import textwrap
+
+from core import cache
+from core.cache import FileCacheBackend, ResponseCache
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+
+def run_scraper_process(code, cache_dir):
+    """O scraper invalida o cache em outro processo; a API precisa enxergar isso."""
+    env = dict(os.environ, RESPONSE_CACHE_DIR=str(cache_dir))
+    env.pop("RESPONSE_CACHE_BACKEND", None)
+    subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=APP_DIR, env=env, check=True, capture_output=True,
+    )
+
+def test_default_backend_is_shared(response_cache_dir, monkeypatch):
+    monkeypatch.delenv("RESPONSE_CACHE_BACKEND", raising=False)
+    assert isinstance(cache.get_response_cache().backend, FileCacheBackend)
+
+def test_save_in_other_process_invalidates_api_cache(response_cache_dir, tmp_path):
+    api_cache = ResponseCache(backend=FileCacheBackend(str(response_cache_dir)))
+    key = api_cache.competence_key("2025-07")
+    api_cache.set(key, b'{"total":0}')
+    other_key = api_cache.competence_key("2025-06")
+    api_cache.set(other_key, b'{"total":1}')
+
+    run_scraper_process(f"""
+        from datetime import datetime
+        from core.database import DatabaseManager, init_db, get_engine
+        url = "sqlite:///{tmp_path / 'db.sqlite'}"
+        init_db(get_engine(url))
+        DatabaseManager(url).save_publications([{{
+            "title": "Publicação", "date": datetime(2025, 7, 10), "competence": "2025-07",
+            "link": "https://example.com/1", "file_url": "https://0x0.st/1.pdf",
+        }}], raise_errors=True)
+    """, response_cache_dir)
+
+    assert api_cache.get(key) is None
+    assert api_cache.get(other_key) is not None
@@ -0,0 +1,84 @@
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from core.database import ShardLease
+from core.shard_leases import ShardLeaseQueue, SHARD_PENDING, SHARD_LEASED, SHARD_DONE, SHARD_FAILED
+
+SHARDS = [
+    (datetime(2025, 7, 1), datetime(2025, 7, 7)),
+    (datetime(2025, 7, 8), datetime(2025, 7, 14)),
+]
+
+@pytest.fixture
+def leases(db_url):
+    queue = ShardLeaseQueue(db_url, lease_seconds=60, max_attempts=2, owner="worker-1")
+    queue.register(SHARDS)
+    return queue
+
+def lease_expires_at(leases, shard_id):
+    with leases.engine.connect() as conn:
+        return conn.execute(select(ShardLease.lease_expires_at).where(ShardLease.id == shard_id)).scalar()
+
+def test_register_is_idempotent(leases):
+    assert leases.register(SHARDS) == 0
+    assert leases.counts(SHARDS) == {SHARD_PENDING: 2}
+
+def test_shards_are_leased_once_in_date_order(leases, db_url):
+    other = ShardLeaseQueue(db_url, lease_seconds=60, owner="worker-2")
+    first = leases.lease_next()
+    second = other.lease_next()
+    assert first["start_date"] == SHARDS[0][0]
+    assert second["start_date"] == SHARDS[1][0]
+    assert leases.lease_next() is None
+
+def test_expired_lease_is_reassigned(db_url):
+    crashed = ShardLeaseQueue(db_url, lease_seconds=-1, owner="morto")
+    crashed.register(SHARDS[:1])
+    shard = crashed.lease_next()
+
+    other = ShardLeaseQueue(db_url, lease_seconds=60, owner="worker-2")
+    assert other.lease_next()["id"] == shard["id"]
+    # O worker antigo não consegue mais concluir nem renovar o shard
+    crashed.complete(shard["id"], 10)
+    assert not crashed.renew(shard["id"])
+    assert other.counts() == {SHARD_LEASED: 1}
+
+def test_complete(leases):
+    shard = leases.lease_next()
+    leases.complete(shard["id"], 7)
+    assert leases.counts(SHARDS) == {SHARD_DONE: 1, SHARD_PENDING: 1}
+
+def test_fail_until_max_attempts_then_register_reopens(leases):
+    for _ in range(2):
+        shard = leases.lease_next()
+        assert shard["start_date"] == SHARDS[0][0]
+        leases.fail(shard["id"], "listagem falhou")
+    assert leases.counts(SHARDS) == {SHARD_FAILED: 1, SHARD_PENDING: 1}
+
+    leases.register(SHARDS)
+    assert leases.counts(SHARDS) == {SHARD_PENDING: 2}
+
+def test_renew_extends_the_lease(leases):
+    shard = leases.lease_next()
+    before = lease_expires_at(leases, shard["id"])
+    time.sleep(0.01)
+    assert leases.renew(shard["id"])
+    assert lease_expires_at(leases, shard["id"]) > before
+
+def test_renew_ignores_finished_shards(leases):
+    shard = leases.lease_next()
+    leases.complete(shard["id"], 1)
+    assert not leases.renew(shard["id"])
+    assert lease_expires_at(leases, shard["id"]) is None
+
+def test_heartbeat_keeps_a_slow_shard_leased(db_url):
+    leases = ShardLeaseQueue(db_url, lease_seconds=1, owner="worker-1")
+    leases.register(SHARDS[:1])
+    shard = leases.lease_next()
+    other = ShardLeaseQueue(db_url, lease_seconds=60, owner="worker-2")
+    with leases.heartbeat(shard["id"], interval=0.2):
+        time.sleep(1.5)
+        assert other.lease_next() is None
@@ -0,0 +1,32 @@
+import os
+import stat
+import hashlib
+
+import pytest
+
+from services.streaming import stream_to_file
+
+class FakeResponse:
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+
+    def iter_content(self, chunk_size):
+        yield from self.chunks
+        if self.error:
+            raise self.error
+
+def test_stream_to_file_uses_the_umask_mode(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+    file_path = tmp_path / "dom.pdf"
+    checksum, size = stream_to_file(FakeResponse([b"%PDF", b"", b"-1.4"]), file_path)
+    assert (checksum, size) == (hashlib.sha256(b"%PDF-1.4").hexdigest(), 8)
+    assert file_path.read_bytes() == b"%PDF-1.4"
+    # mkstemp criaria 0600, ilegível para o container da API com outro usuário
+    assert stat.S_IMODE(file_path.stat().st_mode) == 0o666 & ~umask
+
+def test_interrupted_stream_leaves_no_partial_file(tmp_path):
+    with pytest.raises(ConnectionError):
+        stream_to_file(FakeResponse([b"%PDF"], error=ConnectionError("conexão caiu")), tmp_path / "dom.pdf")
+    assert list(tmp_path.iterdir()) == []